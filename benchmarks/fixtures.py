@@ -0,0 +1,61 @@
+from src.env.env import TetrisEnv
+from src.agents.agent import TetrisAgent
+
+ROWS = 22
+COLS = 10
+SEED = 123
+WEIGHTS = [-0.51192248, 0.76122771, -0.35380663, -0.18245166]
+# Deliberately poor weights that stack high and leave holes.
+MESSY_WEIGHTS = [-0.1, 0.1, -0.05, -0.8]
+
+
+def make_env(grid_type="bitboard", track_features=True, seed=SEED):
+    """
+    Create a seeded headless environment.
+
+    Args:
+        grid_type (str): "standard" or "bitboard".
+        track_features (bool): Whether the grid tracks features incrementally.
+        seed (int): Seed for the piece sequence.
+
+    Returns:
+        TetrisEnv: A fresh environment.
+    """
+    return TetrisEnv(ROWS, COLS, "classic", seed, grid_type=grid_type, track_features=track_features)
+
+
+def play_pieces(env, weights, pieces):
+    """
+    Advance an environment by letting a greedy agent place pieces.
+
+    Args:
+        env (TetrisEnv): Environment to advance in place.
+        weights (list[float]): Agent weights.
+        pieces (int): Number of pieces to place.
+
+    Returns:
+        TetrisEnv: The same environment.
+    """
+    agent = TetrisAgent(env, weights, "normal")
+    for _ in range(pieces):
+        if env.game_over:
+            break
+        move = agent.get_best_move()
+        if move is None:
+            break
+        env.apply_move(move)
+    return env
+
+
+def board_fixtures(grid_type="bitboard", track_features=True):
+    """
+    Build the canned boards used by the benchmarks.
+
+    Returns:
+        dict: Mapping of fixture name to TetrisEnv.
+    """
+    return {
+        "opening": make_env(grid_type, track_features),
+        "midgame": play_pieces(make_env(grid_type, track_features), WEIGHTS, 60),
+        "messy": play_pieces(make_env(grid_type, track_features), MESSY_WEIGHTS, 25),
+    }
@@ -0,0 +1,236 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks.fixtures import board_fixtures, make_env, WEIGHTS
+from src.agents.agent import TetrisAgent
+from src.agents.reward import evaluate_state
+
+
+def measure(func, min_time=0.5, repeat=3):
+    """
+    Time a callable, returning the best rate over several rounds.
+
+    Args:
+        func (callable): Work to time; returns the number of operations done.
+        min_time (float): Minimum seconds per round.
+        repeat (int): Number of rounds.
+
+    Returns:
+        float: Operations per second in the fastest round.
+    """
+    best = 0.0
+    for _ in range(repeat):
+        ops = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            ops += func()
+            elapsed = time.perf_counter() - start
+        best = max(best, ops / elapsed)
+    return best
+
+
+def bench_simulate_move(env):
+    """
+    Benchmark simulating every possible move of the current piece.
+
+    Args:
+        env (TetrisEnv): Fixture position.
+
+    Returns:
+        callable: Work for ``measure``, counting simulated placements.
+    """
+    moves = env.get_possible_moves()
+
+    def run():
+        for move in moves:
+            env.simulate_move(move)
+        return len(moves)
+    return run
+
+
+def bench_evaluate_state(env):
+    """
+    Benchmark evaluating the afterstates of every possible move.
+
+    Args:
+        env (TetrisEnv): Fixture position.
+
+    Returns:
+        callable: Work for ``measure``, counting evaluations.
+    """
+    states = [env.simulate_move(move) for move in env.get_possible_moves()]
+
+    def run():
+        for state in states:
+            evaluate_state(state, WEIGHTS)
+        return len(states)
+    return run
+
+
+def bench_clone(env):
+    """
+    Benchmark cloning an environment.
+
+    Args:
+        env (TetrisEnv): Fixture position.
+
+    Returns:
+        callable: Work for ``measure``, counting clones.
+    """
+    def run():
+        for _ in range(100):
+            env.clone()
+        return 100
+    return run
+
+
+def bench_decision(env, mode):
+    """
+    Benchmark one agent decision from a position.
+
+    Args:
+        env (TetrisEnv): Fixture position.
+        mode (str): Agent mode.
+
+    Returns:
+        callable: Work for ``measure``, counting decisions.
+    """
+    def run():
+        # A fresh agent per call so cached lookahead does not skew the rate.
+        TetrisAgent(env, WEIGHTS, mode).get_best_move()
+        return 1
+    return run
+
+
+def bench_full_game(grid_type, max_pieces=200):
+    """
+    Benchmark a greedy agent playing a seeded game.
+
+    Args:
+        grid_type (str): "standard" or "bitboard".
+        max_pieces (int): Piece limit of the game.
+
+    Returns:
+        callable: Work for ``measure``, counting placed pieces.
+    """
+    def run():
+        env = make_env(grid_type)
+        agent = TetrisAgent(env, WEIGHTS, "normal")
+        placed = 0
+        while placed < max_pieces and not env.game_over:
+            move = agent.get_best_move()
+            if move is None:
+                break
+            env.apply_move(move)
+            placed += 1
+        return placed
+    return run
+
+
+def run_benchmarks(min_time, repeat, modes):
+    """
+    Run the whole suite.
+
+    Args:
+        min_time (float): Minimum seconds per timing round.
+        repeat (int): Timing rounds per benchmark.
+        modes (list[str]): Agent modes to time decisions for.
+
+    Returns:
+        dict: Mapping of benchmark name to {"value", "unit"}.
+    """
+    results = {}
+
+    def record(name, func, unit):
+        value = measure(func, min_time, repeat)
+        results[name] = {"value": value, "unit": unit}
+        print(f"{name:<48} {value:>14.1f} {unit}")
+
+    for grid_type in ("standard", "bitboard"):
+        fixtures = board_fixtures(grid_type)
+        for name, env in fixtures.items():
+            prefix = f"{grid_type}.{name}"
+            record(f"{prefix}.simulate_move", bench_simulate_move(env), "placements/s")
+            record(f"{prefix}.evaluate_state", bench_evaluate_state(env), "calls/s")
+            record(f"{prefix}.clone", bench_clone(env), "clones/s")
+            for mode in modes:
+                record(f"{prefix}.decision.{mode}", bench_decision(env, mode), "decisions/s")
+        record(f"{grid_type}.full_game", bench_full_game(grid_type), "pieces/s")
+    return results
+
+
+def git_commit():
+    """
+    Get the commit the benchmarks ran on.
+
+    Returns:
+        str: Hash of HEAD, or None outside a git checkout.
+    """
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """
+    Print the change against a previous run and flag regressions.
+
+    Args:
+        results (dict): Results of this run.
+        baseline_path (str): JSON report of the previous run.
+        threshold (float): Slowdown ratio reported as a regression.
+
+    Returns:
+        bool: True if any benchmark slowed down by more than the threshold.
+    """
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)["results"]
+    regressed = False
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["value"] / baseline[name]["value"]
+        flag = ""
+        if ratio < 1 - threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"{name:<48} {ratio:>6.2f}x{flag}")
+    return regressed
+
+
+def main():
+    """
+    Run the benchmarks, write a JSON report and optionally compare it.
+    """
+    parser = argparse.ArgumentParser(description="TetrisRL throughput benchmarks.")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON results.")
+    parser.add_argument("--compare", help="Previous JSON results to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown ratio reported as a regression.")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum seconds per timing round.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing rounds per benchmark.")
+    parser.add_argument("--modes", nargs="+", default=["normal", "batched", "promax", "beam"])
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.min_time, args.repeat, args.modes)
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
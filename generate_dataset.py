@@ -0,0 +1,38 @@
+import argparse
+
+from src.agents.dataset import generate_dataset
+from src.utils.config import mode_weights, env_params
+
+
+def main():
+    """
+    Headless self-play dataset generation entry point.
+    """
+    parser = argparse.ArgumentParser(description="Write TetrisRL self-play examples to .npy shards.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--max-pieces", type=int, default=500)
+    parser.add_argument("--strategy", default="normal", help="Agent mode used for self-play.")
+    parser.add_argument("--reachable", action="store_true", help="Use reachable placements as candidates.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shard-size", type=int, default=10000, help="Examples per shard.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--weights", default="hard", choices=list(mode_weights), help="Mode whose weights play.")
+    args = parser.parse_args()
+
+    n_examples = generate_dataset(args.out_dir,
+                                  mode_weights[args.weights]["weights"],
+                                  n_games=args.games,
+                                  strategy=args.strategy,
+                                  reachable=args.reachable,
+                                  max_pieces=args.max_pieces,
+                                  rows=env_params["rows"],
+                                  cols=env_params["cols"],
+                                  seed=args.seed,
+                                  shard_size=args.shard_size,
+                                  workers=args.workers)
+    print(f"Wrote {n_examples} examples to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
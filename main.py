@@ -1,10 +1,15 @@
+import os
 import sys
+import time
 
 import pygame
 
 from src.utils.display import *
 from src.env.env import TetrisEnv
+from src.env.replay import ReplayRecorder
 from src.agents.agent import TetrisAgent
+from src.agents.planner import BackgroundPlanner
+from src.agents.action_plan import ActionPlan
 
 
 DROP_EVENT = pygame.USEREVENT + 1
@@ -35,24 +40,38 @@ def main():
                               env_params["cols"],
                               env_params["piece_generator"],
                               env_params["random_seed"],
-                              mode_weights[mode]["level"])
+                              mode_weights[mode]["level"],
+                              env_params["grid_type"],
+                              env_params["track_features"])
         env_agent = TetrisEnv(env_params["rows"],
                               env_params["cols"],
                               env_params["piece_generator"],
                               env_params["random_seed"],
-                              mode_weights[mode]["level"])
+                              mode_weights[mode]["level"],
+                              env_params["grid_type"],
+                              env_params["track_features"])
+
+        AGENT_ACTION_DELAY = mode_weights[mode]["delay"]
 
         agent = TetrisAgent(
             env_agent,
             mode_weights[mode]["weights"],
-            mode_weights[mode]["strategy"])
-
-        AGENT_ACTION_DELAY = mode_weights[mode]["delay"]
+            mode_weights[mode]["strategy"],
+            time_budget=AGENT_ACTION_DELAY / 1000)
+        planner = BackgroundPlanner(agent)
 
         pygame.time.set_timer(AGENT_ACTION_EVENT, AGENT_ACTION_DELAY)
 
-        agent_actions = []
+        replay_dir = os.path.join(get_data_dir(), "replays")
+        os.makedirs(replay_dir, exist_ok=True)
+        recorder = ReplayRecorder(os.path.join(replay_dir, time.strftime("%Y%m%d-%H%M%S") + ".replay"),
+                                  [env_human, env_agent])
+
+        agent_plan = None
         game_active = True
+        human_renderer = BoardRenderer(0)
+        agent_renderer = BoardRenderer(1)
+        full_redraw = True
 
         while game_active:
             for event in pygame.event.get():
@@ -60,29 +79,14 @@ def main():
                     game_active = False
                     running = False
                 elif event.type == AGENT_ACTION_EVENT:
-                    if not agent_actions:
-                        best_move = agent.get_best_move()
+                    if agent_plan is None or agent_plan.done:
+                        best_move = planner.poll(env_agent)
                         if best_move is not None:
-                            actions = []
-                            for _ in range(best_move["rotations"]):
-                                actions.append(("rotate", True))
-                            dx = best_move["x"] - env_agent.current_piece.x
-                            if dx > 0:
-                                for _ in range(dx):
-                                    actions.append(("move", 1))
-                            elif dx < 0:
-                                for _ in range(-dx):
-                                    actions.append(("move", -1))
-                            actions.append(("drop", None))
-                            agent_actions = actions
+                            agent_plan = ActionPlan.from_move(env_agent, best_move)
+                            if not ui_config["animate_agent"]:
+                                agent_plan.apply(env_agent)
                     else:
-                        action, value = agent_actions.pop(0)
-                        if action == "rotate":
-                            env_agent.rotate_piece(clockwise=value)
-                        elif action == "move":
-                            env_agent.move_piece(value, 0)
-                        elif action == "drop":
-                            env_agent.hard_drop()
+                        agent_plan.step(env_agent)
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_LEFT:
                         env_human.move_piece(-1, 0)
@@ -101,7 +105,7 @@ def main():
                         pygame.time.set_timer(AGENT_ACTION_EVENT, 0)
                         check = draw_pause_menu(screen, font)
                         if check == "resume":
-                            screen.fill(ui_config["background_color"])
+                            full_redraw = True
                             pygame.time.set_timer(AGENT_ACTION_EVENT, AGENT_ACTION_DELAY)
                         elif check == "restart":
                             play_again = True
@@ -113,17 +117,15 @@ def main():
             env_human.update(dt)
             env_agent.update(dt)
 
-            screen.fill(ui_config["background_color"])
-            draw_grid(0, screen, env_human.grid.board)
-            draw_grid(1, screen, env_agent.grid.board)
-            ghost_piece_human = env_human.get_ghost_piece()
-            draw_ghost_piece(0, screen, ghost_piece_human)
-            ghost_piece_agent = env_agent.get_ghost_piece()
-            draw_ghost_piece(1, screen, ghost_piece_agent)
-            draw_piece(0, screen, env_human.current_piece.get_cells(), env_human.current_piece.color)
-            draw_piece(1, screen, env_agent.current_piece.get_cells(), env_agent.current_piece.color)
+            if full_redraw:
+                screen.fill(ui_config["background_color"])
+            dirty_rects = human_renderer.draw(screen, env_human.grid.board, env_human.current_piece,
+                                              env_human.get_ghost_piece())
+            dirty_rects += agent_renderer.draw(screen, env_agent.grid.board, env_agent.current_piece,
+                                               env_agent.get_ghost_piece())
             pause_button_rect = draw_panel(0, screen, env_human, font, mode)
             draw_panel(1, screen, env_agent, font, mode)
+            dirty_rects += [get_panel_rect(0), get_panel_rect(1)]
 
 
             if env_human.game_over:
@@ -157,6 +159,8 @@ def main():
                     game_active = False
                     check = "restart"
             if not game_active:
+                planner.close()
+                recorder.close()
                 save_score(player_name, env_human.score)
 
                 # Option to play again with different name
@@ -167,7 +171,11 @@ def main():
                         player_name = ""  # Reset name
                 else:
                     running = False
-            pygame.display.flip()
+            if full_redraw or env_human.game_over or env_agent.game_over:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty_rects)
+            full_redraw = False
             clock.tick(ui_config["fps"])
     pygame.quit()
     sys.exit()
@@ -0,0 +1,108 @@
+from src.env.move_generator import Placement, move_actions
+
+
+def apply_action(env, action):
+    """
+    Apply one input action to an environment.
+
+    Args:
+        env: Tetris environment.
+        action (tuple): (kind, value) action, e.g. ``("move", -1)``.
+
+    Returns:
+        bool: True if the action took effect.
+    """
+    kind, value = action
+    if kind == "rotate":
+        return env.rotate_piece(clockwise=value)
+    if kind == "move":
+        return env.move_piece(value, 0)
+    if kind == "down":
+        return env.move_piece(0, 1)
+    if kind == "drop":
+        env.hard_drop()
+        return True
+    raise ValueError(f"Unknown action {kind}.")
+
+
+class ActionPlan:
+    """
+    A chosen move compiled once into its input sequence.
+
+    The actions can be played one per tick with ``step`` to animate the
+    move, or the whole placement can be committed at once with ``apply``.
+    """
+
+    def __init__(self, move, actions):
+        """
+        Initialize the plan.
+
+        Args:
+            move (Move or Placement): The planned move.
+            actions (tuple): Its input sequence, ending with a hard drop.
+        """
+        self.move = move
+        self.actions = actions
+        self.cursor = 0
+
+    @classmethod
+    def from_move(cls, env, move):
+        """
+        Compile a move for the environment's current piece.
+
+        Placements already carry their input sequence from the move
+        generator; rotate-shift-drop moves are compiled from the piece's
+        current column.
+
+        Args:
+            env: Tetris environment.
+            move (Move or Placement): Move chosen for the current piece.
+
+        Returns:
+            ActionPlan: The compiled plan.
+        """
+        if isinstance(move, Placement):
+            return cls(move, move.actions)
+        return cls(move, move_actions(env.current_piece, move))
+
+    @property
+    def done(self):
+        """bool: Whether every action has been played."""
+        return self.cursor >= len(self.actions)
+
+    def __len__(self):
+        return len(self.actions) - self.cursor
+
+    def step(self, env):
+        """
+        Play the next action.
+
+        Args:
+            env: Tetris environment the plan was compiled for.
+
+        Returns:
+            bool: True if the action took effect.
+        """
+        action = self.actions[self.cursor]
+        self.cursor += 1
+        return apply_action(env, action)
+
+    def apply(self, env):
+        """
+        Commit the rest of the placement.
+
+        An untouched plan is applied in a single environment call; a plan
+        that was partly stepped plays its remaining actions.
+
+        Args:
+            env: Tetris environment the plan was compiled for.
+
+        Returns:
+            bool: True if the placement was applied.
+        """
+        if self.cursor:
+            while not self.done:
+                self.step(env)
+            return True
+        self.cursor = len(self.actions)
+        return env.apply_move(self.move)
@@ -1,88 +1,724 @@
+import time
+from collections import Counter
+
+import numpy as np
+
 from src.agents.reward import evaluate_state
+from src.agents.batch import evaluate_moves
+from src.agents.features import FeatureSet
+from src.agents.transposition import TranspositionTable
+from src.env.piece import Piece, SHAPES
+
+
+# Shortest expectimax search, in plies, worth sending to the worker pool.
+PARALLEL_MIN_DEPTH = 3
+
+# Expectimax value of each ply left when a piece cannot be placed without
+# losing: finite, so a move that loses on some branches still ranks by how
+# likely the loss is, and far below any evaluation a game reaches.
+LOSS_SCORE = -1e6
+
+
+class SearchTimeout(Exception):
+    """Raised inside a search when the decision deadline has passed."""
 
 
 class TetrisAgent:
     """Agent for selecting the best Tetris move using linear evaluation."""
 
-    def __init__(self, env, weights, mode='normal'):
+    def __init__(self, env, weights, mode='normal', table_size=200000,
+                 search_depth=3, beam_width=10, time_budget=None, reachable=False,
+                 min_probability=0.02, workers=None, features=None, reuse_plans=False):
         """
         Initialize the agent.
 
         Args:
             env: Tetris environment.
             weights (np.array): Weight vector for state evaluation.
+            mode (str): Move selection strategy.
+            table_size (int): Capacity of the lookahead transposition table.
+            search_depth (int): Plies searched by the beam and expectimax strategies.
+            beam_width (int): Nodes kept per ply by the beam strategy, and
+                children expanded per max node by expectimax.
+            time_budget (float): Seconds allowed per lookahead decision, or
+                None for no limit.
+            reachable (bool): Search all placements reachable with soft drops,
+                slides and tucks instead of only rotate-shift-drop moves.
+            min_probability (float): Chance branches less likely than this are
+                pruned from lookahead searches.
+            workers (int): Number of worker processes scoring root moves of
+                expectimax searches of ``PARALLEL_MIN_DEPTH`` or more plies in
+                parallel, or None to search in this process. Call ``close()``
+                when done.
+            features (list[str]): Registered feature names matching the
+                weights (see ``src.agents.features``), or None for the four
+                default features.
+            reuse_plans (bool): Let the lookahead strategies play the
+                continuation planned by the previous decision, without a new
+                search, when the board matches the afterstate it predicted.
+                This halves the searches per piece, but the reused move was
+                chosen before the latest preview piece was known.
         """
         self.env = env
-        self.weights = weights
         self.mode = mode
+        self.search_depth = search_depth
+        self.beam_width = beam_width
+        self.time_budget = time_budget
+        self.reachable = reachable
+        self.min_probability = min_probability
+        # Lookahead results keyed by board; kept across decisions and cleared
+        # when the weights or features are replaced.
+        self.table = TranspositionTable(table_size)
+        self.workers = workers
+        self._pool = None
+        self.reuse_plans = reuse_plans
+        # (predicted decision key, planned move) from the last lookahead decision.
+        self._plan = None
+        # threading.Event that, once set, stops the running search as if its
+        # time budget ran out (see ``BackgroundPlanner.close``).
+        self.stop_event = None
+        self._weights = weights
+        self.features = features
+
+    @property
+    def weights(self):
+        """Weight vector for state evaluation."""
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights):
+        """
+        Replace the weights; results computed with the old ones are dropped.
+
+        Assign a new vector instead of changing the current one in place.
+
+        Args:
+            weights (np.array): Weight vector for state evaluation.
+        """
+        self._weights = weights
+        self._forget_searches()
+
+    @property
+    def features(self):
+        """FeatureSet matching the weights, or None for the four default features."""
+        return self._features
+
+    @features.setter
+    def features(self, features):
+        """
+        Replace the features; results computed with the old ones are dropped.
+
+        Args:
+            features (list[str]): Registered feature names, or None.
+        """
+        self._features = FeatureSet(features) if features is not None else None
+        # The landing height depends on the last placement, not only the board.
+        self._keys_landing_height = self._features is not None and "landing_height" in self._features.names
+        self._forget_searches()
+
+    def _forget_searches(self):
+        """Drop cached values, the pending plan and workers set up for other weights."""
+        self.table.clear()
+        self._plan = None
+        self.close()
+
+    def close(self):
+        """Shut down the worker processes, if any were started."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def candidate_moves(self, state):
+        """
+        Generate the candidate moves for a state's current piece.
+
+        Args:
+            state: Game state.
+
+        Returns:
+            list: Move tuples, or Placement tuples when ``reachable`` is set.
+        """
+        if self.reachable:
+            return state.get_reachable_placements()
+        return state.get_possible_moves()
+
+    def evaluate_cached(self, state):
+        """
+        Evaluate a state, reusing earlier evaluations of the same board.
+
+        The key also holds the lines just cleared and, when a feature uses
+        it, the landing height, since those depend on the last placement.
+
+        Args:
+            state: Game state containing grid.
+
+        Returns:
+            float: The evaluation score.
+        """
+        grid = state.grid
+        key = ("eval", grid.board_key(), grid.lines_cleared,
+               grid.landing_height if self._keys_landing_height else None)
+        score = self.table.get(key)
+        if score is None:
+            score = evaluate_state(state, self.weights, self.features)
+            self.table.put(key, score)
+        return score
+
+    def best_continuation(self, state):
+        """
+        Find the best move for the state's current piece, using the table.
+
+        Args:
+            state: Game state to search from.
+
+        Returns:
+            tuple: (best score or -inf if no move exists, best move or None).
+        """
+        key = ("move", state.grid.board_key(), state.current_piece.shape)
+        entry = self.table.get(key)
+        if entry is None:
+            best_score = float('-inf')
+            best_move = None
+            for move in self.candidate_moves(state):
+                next_state = state.simulate_move(move)
+                if next_state is None:
+                    continue
+                score = self.evaluate_cached(next_state)
+                if score > best_score:
+                    best_score = score
+                    best_move = move
+            entry = (best_score, best_move)
+            self.table.put(key, entry)
+        return entry
 
     def get_best_move_normal(self):
         """
         Compute the best move based on state evaluation.
 
         Returns:
-            dict: The best move.
+            Move: The best move.
         """
         best_score = float('-inf')
         best_move = None
-        for move in self.env.get_possible_moves():
+        for move in self.candidate_moves(self.env):
             simulated_state = self.env.simulate_move(move)
-            score = evaluate_state(simulated_state, self.weights)
+            score = evaluate_state(simulated_state, self.weights, self.features)
             if score > best_score:
                 best_score = score
                 best_move = move
         return best_move
 
+    def get_best_move_batched(self):
+        """
+        Compute the best move by scoring all placements in one vectorized batch.
+
+        Returns:
+            Move: The best move.
+        """
+        moves = self.candidate_moves(self.env)
+        if not moves:
+            return None
+        if self.features is not None:
+            afterstates = [self.env.simulate_move(move) for move in moves]
+            scores = self.features.matrix(afterstates) @ np.asarray(self.weights, dtype=float)
+        else:
+            scores = evaluate_moves(self.env, moves, self.weights)
+        return moves[int(scores.argmax())]
+
     def get_best_move_promax(self):
         """
         Compute the best move considering current and next moves.
 
+        The ten best moves by their own evaluation are searched one piece
+        deeper. Since candidates are distinct placements, these are ten
+        different afterstates.
+
         Returns:
-            dict: The best move.
+            Move: The best move.
         """
         beam_width = 10
-        possible_moves = self.env.get_possible_moves()
+        return self._best_root_move(self._root_children(None)[:beam_width], 2, None)
 
-        current_moves_info = []
-        for move in possible_moves:
-            simulated_state = self.env.simulate_move(move)
-            if simulated_state is None:
-                continue
-            current_score = evaluate_state(simulated_state, self.weights)
-            current_moves_info.append((move, current_score, simulated_state))
+    def _root_children(self, deadline):
+        """
+        Evaluate the state after each move of the current piece.
+
+        When the deadline passes part-way, only the moves evaluated so far
+        are returned; at least one valid move is always evaluated.
+
+        Args:
+            deadline (float): Search deadline, or None.
+
+        Returns:
+            list: (score, move, state) tuples, best first.
+        """
+        children = []
+        for move in self.candidate_moves(self.env):
+            if children and self._out_of_time(deadline):
+                break
+            child = self.env.simulate_move(move)
+            if child is not None:
+                children.append((self.evaluate_cached(child), move, child))
+        children.sort(key=lambda item: item[0], reverse=True)
+        return children
+
+    def continuation_value(self, state, depth, deadline=None):
+        """
+        Value of the best play after a root move, as searched by the current mode.
+
+        Args:
+            state: Game state after the root move.
+            depth (int): Search depth including the root ply.
+            deadline (float): Search deadline, or None.
+
+        Returns:
+            tuple: (value to add to the root move's own evaluation, best move
+            for the state's current piece or None).
+        """
+        if self.mode == "promax":
+            best_next_score, best_next_move = self.best_continuation(state)
+            return (0 if best_next_score == float('-inf') else best_next_score), best_next_move
+        if state.game_over:
+            return LOSS_SCORE * (depth - 1), None
+        # The next piece is known from the preview; later ones are chance nodes.
+        value, move, _, _ = self._max_node(state, self._remaining_bag(), depth - 1, 1.0, deadline)
+        return value, move
+
+    def _best_root_move(self, children, depth, deadline):
+        """
+        Pick the root move with the best evaluation plus continuation value.
+
+        With ``workers`` set, expectimax searches of at least
+        ``PARALLEL_MIN_DEPTH`` plies score the continuations in the worker
+        pool, which keeps its processes and their tables between decisions.
+        Shallower searches cost less than shipping the work to the workers.
+
+        Args:
+            children (list): (score, move, state) tuples, best first.
+            depth (int): Search depth including the root ply.
+            deadline (float): Search deadline, or None.
+
+        Returns:
+            Move: The best move; the first one if every continuation loses.
+        """
+        if not children:
+            return None
+        if self.workers and self.mode == "expectimax" and depth >= PARALLEL_MIN_DEPTH:
+            if self._pool is None:
+                from src.agents.parallel import RootPool
+                self._pool = RootPool(self, self.workers)
+            continuations = self._pool.continuation_values(
+                self.env, [move for _, move, _ in children], depth, deadline)
+            if continuations is None:
+                raise SearchTimeout()
+        else:
+            continuations = [self.continuation_value(child, depth, deadline) for _, _, child in children]
+        best_score = float('-inf')
+        best_index = 0
+        for index, ((score, _, _), (value, _)) in enumerate(zip(children, continuations)):
+            if score + value > best_score:
+                best_score = score + value
+                best_index = index
+        _, best_move, best_child = children[best_index]
+        if self.reuse_plans:
+            self._remember_plan(best_child, continuations[best_index][1])
+        return best_move
+
+    @staticmethod
+    def _plan_key(state):
+        """
+        Get the key of a decision point for plan reuse.
+
+        Args:
+            state: Game state.
+
+        Returns:
+            tuple: Board and current piece shape, rotation and column.
+        """
+        piece = state.current_piece
+        return state.grid.board_key(), piece.shape, piece.rotation_index, piece.x
+
+    def _remember_plan(self, afterstate, move):
+        """
+        Keep the move planned for the position after the chosen root move.
+
+        Args:
+            afterstate: Predicted state after the root move, or None.
+            move: Planned move for its current piece, or None.
+        """
+        if afterstate is None or move is None or afterstate.game_over:
+            self._plan = None
+        else:
+            self._plan = (self._plan_key(afterstate), move)
+
+    def _take_plan(self):
+        """
+        Get the planned move if the environment reached the predicted position.
+
+        The plan is used at most once.
+
+        Returns:
+            Move: The planned move, or None.
+        """
+        plan, self._plan = self._plan, None
+        if plan is not None and plan[0] == self._plan_key(self.env):
+            return plan[1]
+        return None
+
+    def _out_of_time(self, deadline):
+        """
+        Check whether the running search has to stop.
+
+        Args:
+            deadline (float): ``time.perf_counter()`` value, or None.
+
+        Returns:
+            bool: True once the deadline has passed or ``stop_event`` is set.
+        """
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+        return deadline is not None and time.perf_counter() > deadline
+
+    def _check_deadline(self, deadline):
+        """
+        Abort the running search if the deadline has passed.
+
+        Args:
+            deadline (float): ``time.perf_counter()`` value, or None.
+        """
+        if self._out_of_time(deadline):
+            raise SearchTimeout()
+
+    def _remaining_bag(self):
+        """
+        Get the pieces still to be drawn from the current bag.
+
+        Returns:
+            list[str]: Shapes left in the bag, or None for the random
+            generator, whose draws do not depend on earlier ones.
+        """
+        if self.env.generator == "classic":
+            return list(self.env.current_bag)
+        return None
+
+    @staticmethod
+    def _piece_distribution(bag):
+        """
+        Get the probability of each shape being drawn next.
+
+        Args:
+            bag (list[str]): Shapes left in the current bag, empty when a new
+                bag follows, or None for uniform random draws.
+
+        Returns:
+            list[tuple]: (shape, probability) pairs, most likely first and
+            equally likely ones by shape.
+        """
+        pool = bag if bag else list(SHAPES)
+        return sorted(((shape, count / len(pool)) for shape, count in Counter(pool).items()),
+                      key=lambda item: (-item[1], item[0]))
+
+    @staticmethod
+    def _bag_key(bag):
+        """
+        Get the table key of a bag.
+
+        Args:
+            bag (list[str]): Shapes left in the current bag, or None.
+
+        Returns:
+            tuple: Sorted shapes, or None for random draws.
+        """
+        return None if bag is None else tuple(sorted(bag))
+
+    def _cached_node(self, key, probability):
+        """
+        Look up a searched node that is valid at a reach probability.
+
+        Args:
+            key (tuple): Table key of the node.
+            probability (float): Probability of reaching the node.
+
+        Returns:
+            tuple: The stored entry, ending with its probability range, or
+            None if the node is not stored or its search pruned differently.
+        """
+        entry = self.table.get(key)
+        if entry is not None and entry[-2] <= probability < entry[-1]:
+            return entry
+        return None
+
+    @staticmethod
+    def _with_piece(state, shape):
+        """
+        Clone a state with its current piece replaced by a freshly spawned one.
+
+        Args:
+            state: Game state.
+            shape (str): Shape of the piece to spawn.
+
+        Returns:
+            TetrisEnv: The cloned state.
+        """
+        new_state = state.clone()
+        piece = Piece(shape)
+        piece.x = (new_state.grid.cols - piece.piece_width) // 2
+        new_state.current_piece = piece
+        return new_state
 
-        current_moves_info.sort(key=lambda x: x[1], reverse=True)
+    def _max_node(self, state, bag, plies, probability, deadline):
+        """
+        Best value of placing the state's current piece and continuing.
+
+        Only the ``beam_width`` best children by immediate evaluation are
+        searched deeper. Results are cached per (board, piece, bag, plies)
+        together with the best move and the range of reach probabilities
+        over which the search prunes the same branches; a lookup outside
+        that range searches the node again, so the cache never changes a
+        result.
+
+        Args:
+            state: Game state whose current piece is to be placed.
+            bag (list[str]): Shapes left in the current bag after this piece,
+                or None for random draws.
+            plies (int): Plies left, including this one.
+            probability (float): Probability of reaching this node.
+            deadline (float): Search deadline, or None.
 
-        best_total_score = float('-inf')
+        Returns:
+            tuple: (best sum of evaluations, best move or None if every move
+            loses, lowest and highest reach probability the result holds for).
+        """
+        key = ("max", state.grid.board_key(), state.current_piece.shape, self._bag_key(bag), plies)
+        entry = self._cached_node(key, probability)
+        if entry is not None:
+            return entry
+        children = []
+        for move in self.candidate_moves(state):
+            self._check_deadline(deadline)
+            child = state.simulate_move(move)
+            if child is not None and not child.game_over:
+                children.append((self.evaluate_cached(child), move, child))
+        value = LOSS_SCORE * plies
         best_move = None
+        low, high = 0.0, float('inf')
+        if plies > 1:
+            children.sort(key=lambda item: item[0], reverse=True)
+            children = children[:self.beam_width]
+        for score, move, child in children:
+            if plies > 1:
+                expected, child_low, child_high = self._chance_node(
+                    child, bag, plies - 1, probability, deadline)
+                score += expected
+                low, high = max(low, child_low), min(high, child_high)
+            if best_move is None or score > value:
+                value = score
+                best_move = move
+        entry = (value, best_move, low, high)
+        self.table.put(key, entry)
+        return entry
 
-        for move, current_score, simulated_state in current_moves_info[:beam_width]:
-            next_moves = simulated_state.get_possible_moves()
-            best_next_score = float('-inf')
-            for next_move in next_moves:
-                next_state = simulated_state.simulate_move(next_move)
-                if next_state is None:
+    def _chance_node(self, state, bag, plies, probability, deadline):
+        """
+        Expected best value over the next unknown pieces.
+
+        Branches over the shapes still possible from the bag. Branches whose
+        path probability falls below ``min_probability`` are skipped and the
+        rest renormalized. Results are cached per (board, bag, plies) with
+        their probability range as in ``_max_node``, so subtrees shared by
+        different move orders are searched once.
+
+        Args:
+            state: Game state after the known pieces were placed.
+            bag (list[str]): Shapes left in the current bag, or None for random
+                draws.
+            plies (int): Number of unknown pieces to look ahead.
+            probability (float): Probability of reaching this node.
+            deadline (float): Search deadline, or None.
+
+        Returns:
+            tuple: (expected sum of evaluations over the plies, lowest and
+            highest reach probability the result holds for).
+        """
+        if plies == 0:
+            return 0.0, 0.0, float('inf')
+        key = ("chance", state.grid.board_key(), self._bag_key(bag), plies)
+        entry = self._cached_node(key, probability)
+        if entry is not None:
+            return entry
+        expected = 0.0
+        total = 0.0
+        low, high = 0.0, float('inf')
+        for index, (shape, shape_probability) in enumerate(self._piece_distribution(bag)):
+            # The branch is searched from this reach probability on. The most
+            # likely one is always kept so the node has a value.
+            threshold = self.min_probability / shape_probability
+            if index > 0:
+                if probability < threshold:
+                    high = min(high, threshold)
                     continue
-                score_next = evaluate_state(next_state, self.weights)
-                if score_next > best_next_score:
-                    best_next_score = score_next
-            if best_next_score == float('-inf'):
-                best_next_score = 0
-            total_score = current_score + best_next_score
-            if total_score > best_total_score:
-                best_total_score = total_score
+                low = max(low, threshold)
+            remaining = None
+            if bag is not None:
+                remaining = list(bag) if bag else list(SHAPES)
+                remaining.remove(shape)
+            best, _, child_low, child_high = self._max_node(
+                self._with_piece(state, shape), remaining, plies,
+                probability * shape_probability, deadline)
+            low = max(low, child_low / shape_probability)
+            high = min(high, child_high / shape_probability)
+            expected += shape_probability * best
+            total += shape_probability
+        entry = (expected / total, low, high)
+        self.table.put(key, entry)
+        return entry
+
+    def _beam_search(self, children, depth, deadline):
+        """
+        Run one beam search of fixed depth.
+
+        The current and next pieces are expanded as beam plies; plies beyond
+        the preview use the expected value over the remaining bag.
+
+        Args:
+            children (list): ``_root_children`` of the current state.
+            depth (int): Number of plies.
+            deadline (float): Search deadline, or None.
+
+        Returns:
+            Move: The best move, or None if no move exists.
+        """
+        if not children:
+            return None
+        # Nodes are (root move, next piece's move, state, accumulated score).
+        beam = [(move, None, child, float('-inf') if child.game_over and depth > 1 else score)
+                for score, move, child in children]
+        beam.sort(key=lambda node: node[3], reverse=True)
+        beam = beam[:self.beam_width]
+        known_plies = min(depth, 2)
+        for ply in range(1, known_plies):
+            candidates = []
+            for root_move, _, state, score in beam:
+                for move in self.candidate_moves(state):
+                    self._check_deadline(deadline)
+                    child = state.simulate_move(move)
+                    if child is None:
+                        continue
+                    value = score + self.evaluate_cached(child)
+                    if child.game_over and ply < depth - 1:
+                        value = float('-inf')
+                    candidates.append((root_move, move, child, value))
+            if not candidates:
+                break
+            candidates.sort(key=lambda node: node[3], reverse=True)
+            beam = candidates[:self.beam_width]
+
+        best_move, next_move, _, best_score = beam[0]
+        if depth > known_plies:
+            bag = self._remaining_bag()
+            best_score = float('-inf')
+            for root_move, move, state, score in beam:
+                if score == float('-inf'):
+                    continue
+                value = score + self._chance_node(state, bag, depth - known_plies, 1.0, deadline)[0]
+                if value > best_score:
+                    best_score = value
+                    best_move, next_move = root_move, move
+        if self.reuse_plans:
+            self._remember_plan(self.env.simulate_move(best_move), next_move)
+        return best_move
+
+    def get_best_move_beam(self):
+        """
+        Compute the best move with an anytime depth-limited beam search.
+
+        Depths 1 to ``search_depth`` are searched in turn; when the time
+        budget runs out the best move of the deepest completed search is
+        returned. If it runs out while the current piece's moves are still
+        being evaluated, the best of those evaluated so far is returned.
+
+        Returns:
+            Move: The best move.
+        """
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.perf_counter() + self.time_budget
+        children = self._root_children(deadline)
+        best_move = self._beam_search(children, 1, deadline)
+        for depth in range(2, self.search_depth + 1):
+            try:
+                move = self._beam_search(children, depth, deadline)
+            except SearchTimeout:
+                break
+            if move is not None:
                 best_move = move
+        return best_move
 
+    def _expectimax_search(self, children, depth, deadline):
+        """
+        Run one expectimax search of fixed depth.
+
+        Args:
+            children (list): ``_root_children`` of the current state.
+            depth (int): Number of plies.
+            deadline (float): Search deadline, or None.
+
+        Returns:
+            Move: The best move, or None if no move exists.
+        """
+        if not children:
+            return None
+        if depth == 1:
+            return children[0][1]
+        return self._best_root_move(children[:self.beam_width], depth, deadline)
+
+    def get_best_move_expectimax(self):
+        """
+        Compute the best move with an anytime expectimax search over the 7-bag.
+
+        The current and next pieces are max nodes; later pieces are chance
+        nodes over the shapes left in the bag. Depths 1 to ``search_depth``
+        are searched in turn within the time budget, as in
+        ``get_best_move_beam``.
+
+        Returns:
+            Move: The best move.
+        """
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.perf_counter() + self.time_budget
+        children = self._root_children(deadline)
+        best_move = self._expectimax_search(children, 1, deadline)
+        for depth in range(2, self.search_depth + 1):
+            try:
+                move = self._expectimax_search(children, depth, deadline)
+            except SearchTimeout:
+                break
+            if move is not None:
+                best_move = move
         return best_move
 
     def get_best_move(self):
         """
         Select the best move based on the agent's evaluation mode.
 
+        With ``reuse_plans`` set, the lookahead strategies first try the
+        continuation planned by the previous decision.
+
         Returns:
-            dict: The best move.
+            Move: The best move.
         """
+        if self.reuse_plans and self.mode in ("promax", "beam", "expectimax"):
+            move = self._take_plan()
+            if move is not None:
+                return move
         if self.mode == "normal":
             return self.get_best_move_normal()
+        elif self.mode == "batched":
+            return self.get_best_move_batched()
         elif self.mode == "promax":
             return self.get_best_move_promax()
+        elif self.mode == "beam":
+            return self.get_best_move_beam()
+        elif self.mode == "expectimax":
+            return self.get_best_move_expectimax()
@@ -0,0 +1,95 @@
+import numpy as np
+
+from src.env.piece import Piece
+from src.env.move_generator import Placement
+
+
+def board_to_array(grid):
+    """
+    Convert a grid's board into a boolean occupancy array.
+
+    Args:
+        grid: Grid or BitboardGrid instance.
+
+    Returns:
+        np.ndarray: Array of shape (rows, cols), True where occupied.
+    """
+    return np.array([[cell != 0 for cell in row] for row in grid.board], dtype=bool)
+
+
+def build_afterstates(env, moves):
+    """
+    Build the board after each move as one boolean array, before line clears.
+
+    Args:
+        env: Tetris environment.
+        moves (list): Moves from ``env.get_possible_moves()`` or placements
+            from ``env.get_reachable_placements()``.
+
+    Returns:
+        np.ndarray: Array of shape (n_moves, rows, cols).
+    """
+    grid = env.grid
+    base = board_to_array(grid)
+    boards = np.repeat(base[None, :, :], len(moves), axis=0)
+    current = env.current_piece
+    n_rotations = len(current.rotations)
+    index_m, index_y, index_x = [], [], []
+    for i, move in enumerate(moves):
+        if isinstance(move, Placement):
+            piece = Piece(current.shape, move.rotation_index, move.x, move.y)
+        else:
+            rotations, x = move
+            piece = Piece(current.shape, (current.rotation_index + rotations) % n_rotations, x, current.y)
+            piece.y = grid.get_drop_y(piece)
+        for cell_x, cell_y in piece.get_cells():
+            if 0 <= cell_y < grid.rows and 0 <= cell_x < grid.cols:
+                index_m.append(i)
+                index_y.append(cell_y)
+                index_x.append(cell_x)
+    boards[index_m, index_y, index_x] = True
+    return boards
+
+
+def compute_batch_features(boards):
+    """
+    Compute evaluation features for a batch of boards.
+
+    Full rows are treated as already cleared, matching what ``evaluate_state``
+    sees after ``Grid.place_piece``.
+
+    Args:
+        boards (np.ndarray): Boolean array of shape (n, rows, cols).
+
+    Returns:
+        np.ndarray: Array of shape (n, 4) with aggregate height, lines
+        cleared, holes and bumpiness per board, in ``get_weights`` order.
+    """
+    full = boards.all(axis=2)
+    keep = ~full
+    lines = full.sum(axis=1)
+    filled = boards & keep[:, :, None]
+    # Number of surviving rows from each row down to the floor, i.e. the
+    # height a block in that row has once the full rows are removed.
+    kept_below = np.cumsum(keep[:, ::-1], axis=1)[:, ::-1]
+    top = filled.argmax(axis=1)
+    heights = np.where(filled.any(axis=1), np.take_along_axis(kept_below, top, axis=1), 0)
+    holes = (heights - filled.sum(axis=1)).sum(axis=1)
+    bumpiness = np.abs(np.diff(heights, axis=1)).sum(axis=1)
+    return np.stack([heights.sum(axis=1), lines, holes, bumpiness], axis=1)
+
+
+def evaluate_moves(env, moves, weights):
+    """
+    Score every move for the current piece in one batched pass.
+
+    Args:
+        env: Tetris environment.
+        moves (list): Moves from ``env.get_possible_moves()``.
+        weights (np.array): Weight vector.
+
+    Returns:
+        np.ndarray: Score per move, same as ``evaluate_state`` on each afterstate.
+    """
+    features = compute_batch_features(build_afterstates(env, moves))
+    return features @ np.asarray(weights, dtype=float)
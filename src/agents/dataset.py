@@ -0,0 +1,197 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.env.env import TetrisEnv
+from src.env.move_generator import Placement
+from src.env.piece import Piece
+from src.env.serialization import SHAPE_IDS
+from src.agents.agent import TetrisAgent
+from src.agents.batch import build_afterstates, compute_batch_features
+from src.agents.features import DEFAULT_FEATURES
+
+
+class ShardWriter:
+    """
+    Buffers self-play examples and writes them to disk in fixed-size shards.
+
+    Each shard is a directory of ``.npy`` arrays that can be opened with
+    ``np.load(..., mmap_mode="r")``:
+
+    * ``boards`` (n, rows) uint16 row bitmasks before the move
+    * ``pieces`` (n, 2) uint8 current and next shape ids
+    * ``offsets`` (n + 1,) int64 range of each example's candidates
+    * ``placements`` (m, 3) int8 rotation index, x and y of each candidate
+    * ``features`` (m, n_features) float32 afterstate features per candidate
+    * ``chosen`` (n,) int32 index of the played candidate within its example
+
+    At most ``shard_size`` examples are held in memory.
+    """
+
+    def __init__(self, out_dir, prefix="shard", shard_size=10000):
+        """
+        Initialize the writer.
+
+        Args:
+            out_dir (str): Dataset directory.
+            prefix (str): Shard directory name prefix.
+            shard_size (int): Examples per shard.
+        """
+        self.out_dir = out_dir
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.n_shards = 0
+        self.n_examples = 0
+        self._reset()
+
+    def _reset(self):
+        """Empty the buffers."""
+        self.boards = []
+        self.pieces = []
+        self.counts = []
+        self.placements = []
+        self.features = []
+        self.chosen = []
+
+    def add(self, board, pieces, placements, features, chosen):
+        """
+        Add one example, writing a shard when the buffer is full.
+
+        Args:
+            board (tuple[int]): Row bitmasks of the board.
+            pieces (tuple[int]): Current and next shape ids.
+            placements (list[tuple]): (rotation_index, x, y) per candidate.
+            features (np.ndarray): Array of shape (n_candidates, n_features).
+            chosen (int): Index of the played candidate.
+        """
+        self.boards.append(board)
+        self.pieces.append(pieces)
+        self.counts.append(len(placements))
+        self.placements.extend(placements)
+        self.features.append(features)
+        self.chosen.append(chosen)
+        if len(self.boards) >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered examples as a new shard."""
+        if not self.boards:
+            return
+        path = os.path.join(self.out_dir, f"{self.prefix}-{self.n_shards:05d}")
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "boards.npy"), np.array(self.boards, dtype=np.uint16))
+        np.save(os.path.join(path, "pieces.npy"), np.array(self.pieces, dtype=np.uint8))
+        np.save(os.path.join(path, "offsets.npy"), np.concatenate([[0], np.cumsum(self.counts)]).astype(np.int64))
+        np.save(os.path.join(path, "placements.npy"), np.array(self.placements, dtype=np.int8).reshape(-1, 3))
+        np.save(os.path.join(path, "features.npy"), np.concatenate(self.features).astype(np.float32))
+        np.save(os.path.join(path, "chosen.npy"), np.array(self.chosen, dtype=np.int32))
+        self.n_shards += 1
+        self.n_examples += len(self.boards)
+        self._reset()
+
+
+def resting_position(env, move):
+    """
+    Get where a move leaves the current piece.
+
+    Args:
+        env: Tetris environment.
+        move (Move or Placement): Move for the current piece.
+
+    Returns:
+        tuple: (rotation_index, x, y) of the locked piece.
+    """
+    if isinstance(move, Placement):
+        return move.rotation_index, move.x, move.y
+    piece = env.current_piece
+    rotation_index = (piece.rotation_index + move.rotations) % len(piece.rotations)
+    target = Piece(piece.shape, rotation_index, move.x, piece.y)
+    return rotation_index, move.x, env.grid.get_drop_y(target)
+
+
+def record_games(task):
+    """
+    Play self-play games and stream their examples to shards.
+
+    Args:
+        task (tuple): (out_dir, prefix, weights, strategy, reachable, features,
+            game_seeds, max_pieces, rows, cols, shard_size).
+
+    Returns:
+        int: Number of examples written.
+    """
+    out_dir, prefix, weights, strategy, reachable, features, game_seeds, max_pieces, rows, cols, shard_size = task
+    writer = ShardWriter(out_dir, prefix, shard_size)
+    for seed in game_seeds:
+        env = TetrisEnv(rows, cols, "classic", seed, grid_type="bitboard", track_features=True)
+        agent = TetrisAgent(env, weights, strategy, reachable=reachable, features=features)
+        for _ in range(max_pieces):
+            if env.game_over:
+                break
+            moves = agent.candidate_moves(env)
+            move = agent.get_best_move()
+            if move is None:
+                break
+            if agent.features is not None:
+                candidate_features = agent.features.matrix([env.simulate_move(candidate) for candidate in moves])
+            else:
+                candidate_features = compute_batch_features(build_afterstates(env, moves))
+            writer.add(env.grid.board_key(),
+                       (SHAPE_IDS[env.current_piece.shape], SHAPE_IDS[env.next_piece.shape]),
+                       [resting_position(env, candidate) for candidate in moves],
+                       candidate_features,
+                       moves.index(move))
+            env.apply_move(move)
+    writer.flush()
+    return writer.n_examples
+
+
+def generate_dataset(out_dir, weights, n_games=100, strategy="normal", reachable=False, features=None,
+                     max_pieces=500, rows=22, cols=10, seed=0, shard_size=10000, workers=None):
+    """
+    Run agent self-play and write (state, candidate features, chosen move) shards.
+
+    Games are split across worker processes; each worker streams its own
+    shards, so memory stays bounded by ``shard_size`` examples per worker.
+
+    Args:
+        out_dir (str): Dataset directory.
+        weights (list[float]): Weight vector of the playing agent.
+        n_games (int): Number of games.
+        strategy (str): Agent mode.
+        reachable (bool): Use reachable placements as candidates.
+        features (list[str]): Registered features matching the weights, also
+            recorded per candidate; None for the four default features.
+        max_pieces (int): Piece limit per game.
+        rows (int): Number of grid rows.
+        cols (int): Number of grid columns.
+        seed (int): Base seed of the piece sequences.
+        shard_size (int): Examples per shard.
+        workers (int): Number of worker processes (defaults to CPU count).
+
+    Returns:
+        int: Number of examples written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, n_games))
+    game_seeds = [seed * 1_000_003 + game for game in range(n_games)]
+    tasks = [(out_dir, f"worker{w:02d}", list(weights), strategy, reachable, features, game_seeds[w::workers],
+              max_pieces, rows, cols, shard_size) for w in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        n_examples = sum(pool.map(record_games, tasks))
+    with open(os.path.join(out_dir, "meta.json"), "w") as f:
+        json.dump({
+            "rows": rows,
+            "cols": cols,
+            "features": list(features or DEFAULT_FEATURES),
+            "shapes": list(SHAPE_IDS),
+            "weights": list(weights),
+            "strategy": strategy,
+            "reachable": reachable,
+            "n_games": n_games,
+            "seed": seed,
+            "n_examples": n_examples,
+        }, f, indent=2)
+    return n_examples
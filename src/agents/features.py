@@ -0,0 +1,219 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Board quantities gathered by one pass of ``scan_board``; features are
+# computed from these instead of rescanning the board.
+BoardScan = namedtuple("BoardScan", [
+    "heights", "holes", "row_transitions", "column_transitions", "wells", "cumulative_wells",
+])
+
+# Feature name -> function(grid, scan) returning a number.
+FEATURES = {}
+
+# The features of the original four-weight vectors, in ``get_weights`` order.
+DEFAULT_FEATURES = ("aggregate_height", "lines_cleared", "holes", "bumpiness")
+
+
+def register_feature(name):
+    """
+    Register a feature function under a name.
+
+    The function receives the grid and its ``BoardScan``; new features should
+    derive from the scan when they can so the board is still read once.
+
+    Args:
+        name (str): Feature name.
+
+    Returns:
+        callable: Decorator registering the function.
+    """
+    def decorator(function):
+        FEATURES[name] = function
+        return function
+    return decorator
+
+
+def scan_board(grid):
+    """
+    Gather every board quantity the registered features need in one pass.
+
+    Rows are processed top-down as bitmasks. Walls count as filled for row
+    transitions and wells, and the floor counts as filled for column
+    transitions. Wells are open empty cells with filled cells or walls on both
+    sides; cumulative wells add 1 + 2 + ... + depth for each well.
+
+    Args:
+        grid: Grid or BitboardGrid instance.
+
+    Returns:
+        BoardScan: The board quantities.
+    """
+    rows, cols = grid.rows, grid.cols
+    full = (1 << cols) - 1
+    walls = 1 | (1 << (cols + 1))
+    transition_mask = (1 << (cols + 1)) - 1
+    right_wall = 1 << (cols - 1)
+    heights = [0] * cols
+    well_depth = [0] * cols
+    covered = 0
+    above = 0
+    open_wells = 0
+    holes = column_transitions = wells = cumulative_wells = 0
+    bits = grid.board_key()
+    # Empty rows above the stack only add the two wall transitions each.
+    top = 0
+    while top < rows and not bits[top]:
+        top += 1
+    row_transitions = 2 * top
+    for y in range(top, rows):
+        row = bits[y]
+        new = row & ~covered
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1] = rows - y
+            new ^= low
+        holes += bin(covered & ~row & full).count("1")
+        covered |= row
+        padded = (row << 1) | walls
+        row_transitions += bin((padded ^ (padded >> 1)) & transition_mask).count("1")
+        column_transitions += bin(row ^ above).count("1")
+        above = row
+        well = ~covered & ((row << 1) | 1) & ((row >> 1) | right_wall) & full
+        ended = open_wells & ~well
+        while ended:
+            low = ended & -ended
+            well_depth[low.bit_length() - 1] = 0
+            ended ^= low
+        open_wells = well
+        while well:
+            low = well & -well
+            x = low.bit_length() - 1
+            well_depth[x] += 1
+            wells += 1
+            cumulative_wells += well_depth[x]
+            well ^= low
+    column_transitions += bin(~above & full).count("1")
+    return BoardScan(heights, holes, row_transitions, column_transitions, wells, cumulative_wells)
+
+
+@register_feature("aggregate_height")
+def aggregate_height(grid, scan):
+    """Sum of the column heights."""
+    return sum(scan.heights)
+
+
+@register_feature("lines_cleared")
+def lines_cleared(grid, scan):
+    """Lines cleared by the last placement."""
+    return grid.lines_cleared
+
+
+@register_feature("holes")
+def holes(grid, scan):
+    """Empty cells with a filled cell above them."""
+    return scan.holes
+
+
+@register_feature("bumpiness")
+def bumpiness(grid, scan):
+    """Sum of height differences between neighbouring columns."""
+    heights = scan.heights
+    return sum(abs(heights[i] - heights[i + 1]) for i in range(len(heights) - 1))
+
+
+@register_feature("max_height")
+def max_height(grid, scan):
+    """Height of the tallest column."""
+    return max(scan.heights)
+
+
+@register_feature("row_transitions")
+def row_transitions(grid, scan):
+    """Filled/empty changes along each row, walls included."""
+    return scan.row_transitions
+
+
+@register_feature("column_transitions")
+def column_transitions(grid, scan):
+    """Filled/empty changes down each column, floor included."""
+    return scan.column_transitions
+
+
+@register_feature("wells")
+def wells(grid, scan):
+    """Open empty cells enclosed on both sides."""
+    return scan.wells
+
+
+@register_feature("cumulative_wells")
+def cumulative_wells(grid, scan):
+    """Wells weighted by depth: 1 + 2 + ... + depth per well."""
+    return scan.cumulative_wells
+
+
+@register_feature("landing_height")
+def landing_height(grid, scan):
+    """Height of the middle of the last placed piece."""
+    return grid.landing_height
+
+
+class FeatureSet:
+    """An ordered selection of registered features with a dot-product scorer."""
+
+    def __init__(self, names=DEFAULT_FEATURES):
+        """
+        Initialize the feature set.
+
+        Args:
+            names (Sequence[str]): Registered feature names, in weight order.
+        """
+        unknown = [name for name in names if name not in FEATURES]
+        if unknown:
+            raise ValueError(f"Unknown features: {', '.join(unknown)}.")
+        self.names = tuple(names)
+        self.functions = [FEATURES[name] for name in self.names]
+
+    def __len__(self):
+        return len(self.names)
+
+    def vector(self, state):
+        """
+        Compute the feature vector of a state.
+
+        Args:
+            state: Game state containing grid.
+
+        Returns:
+            np.ndarray: One float per feature.
+        """
+        grid = state.grid
+        scan = scan_board(grid)
+        return np.array([function(grid, scan) for function in self.functions], dtype=float)
+
+    def matrix(self, states):
+        """
+        Compute the feature vectors of several states.
+
+        Args:
+            states (list): Game states.
+
+        Returns:
+            np.ndarray: Array of shape (len(states), len(self)).
+        """
+        if not states:
+            return np.zeros((0, len(self.names)))
+        return np.stack([self.vector(state) for state in states])
+
+    def score(self, state, weights):
+        """
+        Evaluate a state as the dot product of its features and the weights.
+
+        Args:
+            state: Game state containing grid.
+            weights (np.array): One weight per feature.
+
+        Returns:
+            float: The evaluation score.
+        """
+        return float(self.vector(state) @ np.asarray(weights, dtype=float))
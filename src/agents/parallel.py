@@ -0,0 +1,107 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.agents.agent import SearchTimeout
+from src.env.env import TetrisEnv
+
+# Agent living in each worker process; its transposition table persists
+# across decisions like the parent's.
+_worker_agent = None
+
+
+def _init_worker(agent_class, weights, mode, options):
+    """
+    Create the worker's agent.
+
+    Args:
+        agent_class (type): TetrisAgent or a subclass.
+        weights (list[float]): Weight vector for state evaluation.
+        mode (str): Agent mode.
+        options (dict): Extra keyword arguments for the agent.
+    """
+    global _worker_agent
+    _worker_agent = agent_class(None, weights, mode, **options)
+
+
+def _continuation_values(task):
+    """
+    Score the continuation after each root move; runs in a worker process.
+
+    Args:
+        task (tuple): (encoded root state, root moves, depth, seconds left or None).
+
+    Returns:
+        list[tuple]: One (value, continuation move) pair per move, or None if
+        the time ran out.
+    """
+    encoding, moves, depth, budget = task
+    env = TetrisEnv.from_encoding(encoding, track_colors=False)
+    _worker_agent.env = env
+    deadline = None if budget is None else time.perf_counter() + budget
+    values = []
+    for move in moves:
+        try:
+            values.append(_worker_agent.continuation_value(env.simulate_move(move), depth, deadline))
+        except SearchTimeout:
+            return None
+    return values
+
+
+class RootPool:
+    """Persistent process pool evaluating an agent's root moves in parallel."""
+
+    def __init__(self, agent, workers):
+        """
+        Start the pool.
+
+        Args:
+            agent (TetrisAgent): Agent whose settings the workers copy.
+            workers (int): Number of worker processes.
+        """
+        self.workers = workers
+        options = {
+            "table_size": agent.table.max_size,
+            "search_depth": agent.search_depth,
+            "beam_width": agent.beam_width,
+            "reachable": agent.reachable,
+            "min_probability": agent.min_probability,
+            "features": agent.features.names if agent.features is not None else None,
+        }
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(type(agent), list(agent.weights), agent.mode, options))
+
+    def continuation_values(self, env, moves, depth, deadline):
+        """
+        Score the continuation after each root move across the workers.
+
+        Workers receive ``env.encode()`` without its color layer and the
+        moves. They return each value with the best move for the next piece,
+        so plans can be reused although the searched nodes stay in the
+        workers' tables.
+
+        Args:
+            env: Root game state.
+            moves (list): Root moves to score.
+            depth (int): Search depth including the root ply.
+            deadline (float): ``time.perf_counter()`` deadline, or None.
+
+        Returns:
+            list[tuple]: ``continuation_value`` pair per move, or None if the
+            time ran out.
+        """
+        encoding = env.encode(colors=False)
+        budget = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        chunks = [moves[i::self.workers] for i in range(self.workers)]
+        tasks = [(encoding, chunk, depth, budget) for chunk in chunks if chunk]
+        values = [None] * len(moves)
+        for i, chunk_values in enumerate(self.executor.map(_continuation_values, tasks)):
+            if chunk_values is None:
+                return None
+            values[i::self.workers] = chunk_values
+        return values
+
+    def close(self):
+        """Shut the worker processes down."""
+        self.executor.shutdown()
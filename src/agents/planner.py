@@ -0,0 +1,152 @@
+import queue
+import threading
+from collections import OrderedDict
+
+
+def state_key(env):
+    """
+    Get a hashable key identifying a decision point.
+
+    The piece's row is left out: gravity keeps moving it down while a plan is
+    pending, and the planned move does not depend on it.
+
+    Args:
+        env: Tetris environment.
+
+    Returns:
+        tuple: Board, current piece rotation and column, next piece and bag.
+    """
+    piece = env.current_piece
+    bag = tuple(env.current_bag) if env.generator == "classic" else ()
+    return (env.grid.board_key(), piece.shape, piece.rotation_index, piece.x,
+            env.next_piece.shape, bag)
+
+
+class BackgroundPlanner:
+    """
+    Runs an agent's search on a worker thread so the UI loop never blocks on it.
+
+    The UI calls ``poll`` with the live environment; the first call for a
+    position queues a snapshot for the worker and later calls return the
+    move once it is ready. After answering, the worker speculatively plans
+    the position its move leads to (the next piece is known and clones share
+    the piece stream), so the following decision is usually ready by the time
+    the current piece's actions have played out.
+
+    The agent is owned by the worker thread while the planner is running.
+    ``close`` cancels the running search through the agent's ``stop_event``.
+    """
+
+    def __init__(self, agent, speculate=True, cache_size=16):
+        """
+        Start the worker thread.
+
+        Args:
+            agent (TetrisAgent): Agent used for planning.
+            speculate (bool): Whether to plan the predicted next position.
+            cache_size (int): Planned positions remembered by the worker.
+        """
+        self.agent = agent
+        self.speculate = speculate
+        self.cache_size = cache_size
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.ready = {}
+        self.pending = set()
+        self._planned = OrderedDict()
+        self._stop = threading.Event()
+        agent.stop_event = self._stop
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _plan(self, key, state):
+        """
+        Search a position, reusing the answer if it was planned before.
+
+        Args:
+            key (tuple): ``state_key`` of the position.
+            state: Snapshot of the position.
+
+        Returns:
+            Move: The best move, or None.
+        """
+        if key in self._planned:
+            return self._planned[key]
+        self.agent.env = state
+        move = self.agent.get_best_move()
+        self._planned[key] = move
+        if len(self._planned) > self.cache_size:
+            self._planned.popitem(last=False)
+        return move
+
+    def _run(self):
+        """Worker loop: answer requests, then speculate while idle."""
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            key, state = request
+            move = self._plan(key, state)
+            self.results.put((key, move))
+            if self.speculate and move is not None and self.requests.empty() and not self._stop.is_set():
+                predicted = state.simulate_move(move)
+                if predicted is not None and not predicted.game_over:
+                    predicted_key = state_key(predicted)
+                    self.results.put((predicted_key, self._plan(predicted_key, predicted)))
+
+    def poll(self, env):
+        """
+        Get the planned move for the environment's current position, if ready.
+
+        A position the worker did not predict is queued by the first call and
+        answered on a later one, so on such a miss the caller waits at least
+        one more frame (the UI polls on every agent action tick) instead of
+        blocking on the search.
+
+        Args:
+            env: Live Tetris environment; it is not touched by the worker.
+
+        Returns:
+            Move: The best move, or None while it is still being planned.
+        """
+        while True:
+            try:
+                key, move = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending.discard(key)
+            self.ready[key] = move
+        key = state_key(env)
+        if key in self.ready:
+            move = self.ready.pop(key)
+            if len(self.ready) > self.cache_size:
+                # Mostly answers for positions that were never reached.
+                self.ready.clear()
+            return move
+        if key not in self.pending:
+            self.pending.add(key)
+            self.requests.put((key, env.clone()))
+        return None
+
+    def close(self, timeout=1.0):
+        """
+        Stop the worker thread.
+
+        The running search is cancelled and returns early, so this does not
+        wait for a full search. Searches in the agent's worker processes are
+        not interrupted; a thread still busy after ``timeout`` is left to
+        finish on its own (it is a daemon thread).
+
+        Args:
+            timeout (float): Seconds to wait for the worker thread.
+
+        Returns:
+            bool: Whether the worker thread has stopped.
+        """
+        self._stop.set()
+        self.requests.put(None)
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            return False
+        self.agent.stop_event = None
+        return True
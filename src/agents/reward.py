@@ -99,27 +99,29 @@ def compute_bumpiness(heights):
     return sum(abs(heights[i] - heights[i + 1]) for i in range(len(heights) - 1))
 
 
-def evaluate_state(state, weights):
+def evaluate_state(state, weights, features=None):
     """
     Evaluate the game state using weighted features.
 
     Args:
         state: Game state containing grid.
         weights (np.array): Weight vector.
+        features (FeatureSet, optional): Features matching the weights; the
+            four ``get_weights`` features are used when omitted.
 
     Returns:
         float: The evaluation score.
     """
-    board = state.grid.board
-    rows, cols = state.grid.rows, state.grid.cols
-    heights = compute_column_heights(board, rows, cols)
-    aggregate_height = compute_aggregate_height(heights)
-    complete_lines = state.grid.lines_cleared
-    holes = compute_holes(board, rows, cols)
-    bumpiness = compute_bumpiness(heights)
-    weights_dict = get_weights(weights)
-    score = (weights_dict["AGGREGATE_HEIGHT_WEIGHT"] * aggregate_height +
-             weights_dict["COMPLETE_LINES_WEIGHT"] * complete_lines +
-             weights_dict["HOLES_WEIGHT"] * holes +
-             weights_dict["BUMPINESS_WEIGHT"] * bumpiness)
-    return score
+    if features is not None:
+        return features.score(state, weights)
+    grid = state.grid
+    heights = grid.get_column_heights()
+    if grid.track_features:
+        holes = sum(grid.column_holes)
+    else:
+        holes = compute_holes(grid.board, grid.rows, grid.cols)
+    height_weight, lines_weight, holes_weight, bumpiness_weight = weights
+    return (height_weight * compute_aggregate_height(heights) +
+            lines_weight * grid.lines_cleared +
+            holes_weight * holes +
+            bumpiness_weight * compute_bumpiness(heights))
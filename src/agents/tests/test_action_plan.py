@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from src.env.env import TetrisEnv, Move
+from src.agents.action_plan import ActionPlan, apply_action
+
+
+def test_stepping_and_applying_place_the_same_piece():
+    rng = random.Random(0)
+    for reachable in (False, True):
+        env = TetrisEnv(20, 10, "classic", 1, grid_type="bitboard")
+        for _ in range(150):
+            if env.game_over:
+                break
+            moves = env.get_reachable_placements() if reachable else env.get_possible_moves()
+            move = rng.choice(moves)
+            stepped = env.clone()
+            plan = ActionPlan.from_move(stepped, move)
+            while not plan.done:
+                plan.step(stepped)
+            applied = env.clone()
+            ActionPlan.from_move(applied, move).apply(applied)
+            assert stepped.grid.board_key() == applied.grid.board_key()
+            assert stepped.score == applied.score
+            env = applied
+
+
+def test_compiled_actions():
+    env = TetrisEnv(20, 10, "classic", 2, grid_type="bitboard")
+    x = env.current_piece.x
+    plan = ActionPlan.from_move(env, Move(1, x - 2))
+    assert plan.actions == (("rotate", True), ("move", -1), ("move", -1), ("drop", None))
+    assert len(plan) == 4
+    plan.step(env)
+    assert len(plan) == 3 and not plan.done
+    placement = env.get_reachable_placements()[0]
+    assert ActionPlan.from_move(env, placement).actions == placement.actions
+
+
+def test_apply_after_step_plays_the_rest():
+    env = TetrisEnv(20, 10, "classic", 3, grid_type="bitboard")
+    move = Move(1, 0)
+    reference = env.simulate_move(move)
+    plan = ActionPlan.from_move(env, move)
+    plan.step(env)
+    assert plan.apply(env)
+    assert plan.done
+    assert env.grid.board_key() == reference.grid.board_key()
+
+
+def test_unknown_action_raises():
+    env = TetrisEnv(20, 10, "classic", 4, grid_type="bitboard")
+    with pytest.raises(ValueError):
+        apply_action(env, ("teleport", None))
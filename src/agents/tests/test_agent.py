@@ -0,0 +1,182 @@
+import pytest
+
+from src.agents.agent import LOSS_SCORE, TetrisAgent
+from src.agents.reward import evaluate_state
+from src.env.env import TetrisEnv
+from src.env.piece import Piece, SHAPES
+
+WEIGHTS = [-0.51192248, 0.76122771, -0.35380663, -0.18245166]
+
+
+def make_env(seed, generator="classic"):
+    """
+    Create a headless environment for agent tests.
+
+    Args:
+        seed (int): Seed of the piece stream.
+        generator (str): "random" or "classic" generator.
+
+    Returns:
+        TetrisEnv: The environment.
+    """
+    return TetrisEnv(20, 10, generator, seed, grid_type="bitboard", track_features=True)
+
+
+def test_reused_plans_are_legal_moves():
+    for mode in ("promax", "beam", "expectimax"):
+        env = make_env(1)
+        agent = TetrisAgent(env, WEIGHTS, mode, search_depth=2, reuse_plans=True)
+        reused = 0
+        for _ in range(30):
+            if env.game_over:
+                break
+            planned = agent._plan is not None and agent._plan[0] == agent._plan_key(env)
+            move = agent.get_best_move()
+            assert move in env.get_possible_moves()
+            reused += planned
+            env.apply_move(move)
+        assert reused > 0
+
+
+def test_plan_is_dropped_when_the_next_piece_differs():
+    for mode in ("promax", "beam"):
+        env = make_env(2)
+        agent = TetrisAgent(env, WEIGHTS, mode, search_depth=2, reuse_plans=True)
+        reference = TetrisAgent(env, WEIGHTS, mode, search_depth=2)
+        move = agent.get_best_move()
+        assert agent._plan is not None
+        # The game deals a different piece than the one the plan was made for.
+        env.next_piece = Piece(next(shape for shape in SHAPES if shape != env.next_piece.shape))
+        env.apply_move(move)
+        assert agent._plan[0] != agent._plan_key(env)
+        assert agent.get_best_move() == reference.get_best_move()
+
+        # When the predicted position is reached, the plan is played once.
+        planned = agent._plan[1]
+        env.apply_move(reference.get_best_move())
+        assert agent._plan[0] == agent._plan_key(env)
+        assert agent.get_best_move() == planned
+        assert agent._plan is None
+
+
+def test_shallow_beam_matches_greedy_and_promax():
+    env = make_env(3)
+    greedy = TetrisAgent(env, WEIGHTS, "normal")
+    promax = TetrisAgent(env, WEIGHTS, "promax")
+    beam_1 = TetrisAgent(env, WEIGHTS, "beam", search_depth=1)
+    beam_2 = TetrisAgent(env, WEIGHTS, "beam", search_depth=2, beam_width=10)
+    for _ in range(60):
+        if env.game_over:
+            break
+        move = promax.get_best_move()
+        assert beam_1.get_best_move() == greedy.get_best_move()
+        assert beam_2.get_best_move() == move
+        env.apply_move(move)
+
+
+def test_tiny_budget_still_returns_a_legal_move():
+    for mode in ("beam", "expectimax"):
+        for budget in (0.0, 1e-4):
+            env = make_env(4)
+            agent = TetrisAgent(env, WEIGHTS, mode, search_depth=3, time_budget=budget)
+            for _ in range(10):
+                move = agent.get_best_move()
+                assert move in env.get_possible_moves()
+                env.apply_move(move)
+
+
+def test_parallel_search_matches_sequential():
+    for generator in ("classic", "random"):
+        env = make_env(5, generator)
+        sequential = TetrisAgent(env, WEIGHTS, "expectimax", search_depth=3, reuse_plans=True)
+        parallel = TetrisAgent(env, WEIGHTS, "expectimax", search_depth=3, reuse_plans=True, workers=2)
+        try:
+            for _ in range(4):
+                move = sequential.get_best_move()
+                assert parallel.get_best_move() == move
+                assert parallel._plan is not None and parallel._plan == sequential._plan
+                # Drop the plans so every decision is searched again.
+                sequential._plan = parallel._plan = None
+                env.apply_move(move)
+            assert parallel._pool is not None
+        finally:
+            parallel.close()
+
+
+def expectimax_value(agent, state, bag, plies):
+    """
+    Plain expectimax value of placing the state's piece, without pruning or caching.
+
+    Args:
+        agent (TetrisAgent): Agent providing the weights and piece spawning.
+        state: Game state whose current piece is to be placed.
+        bag (list[str]): Shapes left in the bag after this piece, or None.
+        plies (int): Plies left, including this one.
+
+    Returns:
+        float: Best expected sum of evaluations.
+    """
+    best = None
+    for move in state.get_possible_moves():
+        child = state.simulate_move(move)
+        if child is None or child.game_over:
+            continue
+        value = evaluate_state(child, WEIGHTS)
+        if plies > 1:
+            pool = bag if bag else list(SHAPES)
+            for shape in SHAPES:
+                if shape not in pool:
+                    continue
+                remaining = None
+                if bag is not None:
+                    remaining = list(pool)
+                    remaining.remove(shape)
+                value += pool.count(shape) / len(pool) * expectimax_value(
+                    agent, agent._with_piece(child, shape), remaining, plies - 1)
+        if best is None or value > best:
+            best = value
+    return LOSS_SCORE * plies if best is None else best
+
+
+def test_unpruned_expectimax_matches_plain_expectimax():
+    for generator in ("classic", "random"):
+        env = TetrisEnv(10, 6, generator, 6, grid_type="bitboard", track_features=True)
+        agent = TetrisAgent(env, WEIGHTS, "expectimax", search_depth=3, beam_width=100,
+                            min_probability=0)
+        for _ in range(3):
+            for move in env.get_possible_moves()[:4]:
+                child = env.simulate_move(move)
+                if child.game_over:
+                    continue
+                value, _ = agent.continuation_value(child, 3)
+                assert value == pytest.approx(expectimax_value(agent, child, agent._remaining_bag(), 2))
+            env.apply_move(agent.get_best_move())
+
+
+def test_piece_distribution_sums_to_one():
+    bags = [None, [], ["T"], ["I", "O", "S"], list(SHAPES)]
+    for bag in bags:
+        distribution = TetrisAgent._piece_distribution(bag)
+        assert sum(p for _, p in distribution) == pytest.approx(1.0)
+        assert sorted(shape for shape, _ in distribution) == sorted(bag or SHAPES)
+    assert TetrisAgent._piece_distribution(None) == TetrisAgent._piece_distribution([])
+
+
+def test_cache_does_not_change_pruned_expectimax():
+    for generator in ("classic", "random"):
+        env = make_env(7, generator)
+        cached = TetrisAgent(env, WEIGHTS, "expectimax", search_depth=4, beam_width=3,
+                             min_probability=0.05)
+        uncached = TetrisAgent(env, WEIGHTS, "expectimax", search_depth=4, beam_width=3,
+                               min_probability=0.05, table_size=0)
+        for _ in range(4):
+            children = cached._root_children(None)[:3]
+            for _, _, child in children:
+                # Depth 3 reaches nodes at probability 1 that the previous
+                # decision searched one ply deeper at a lower probability.
+                for depth in (3, 4):
+                    assert cached.continuation_value(child, depth) == uncached.continuation_value(child, depth)
+            move = cached.get_best_move()
+            assert uncached.get_best_move() == move
+            env.apply_move(move)
+        assert cached.table.hits > 0
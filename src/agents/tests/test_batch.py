@@ -0,0 +1,80 @@
+import random
+
+import numpy as np
+
+from src.agents.batch import build_afterstates, compute_batch_features, evaluate_moves
+from src.agents.reward import (evaluate_state, compute_column_heights, compute_aggregate_height,
+                               compute_holes, compute_bumpiness)
+from src.env.env import TetrisEnv
+
+WEIGHTS = [-0.51192248, 0.76122771, -0.35380663, -0.18245166]
+
+
+def scalar_features(state):
+    """
+    Compute the four ``evaluate_state`` features of a state one by one.
+
+    Args:
+        state: Game state containing grid.
+
+    Returns:
+        list[int]: Aggregate height, lines cleared, holes and bumpiness.
+    """
+    grid = state.grid
+    heights = compute_column_heights(grid.board, grid.rows, grid.cols)
+    return [compute_aggregate_height(heights), grid.lines_cleared,
+            compute_holes(grid.board, grid.rows, grid.cols), compute_bumpiness(heights)]
+
+
+def random_positions(seed, grid_type, count=60):
+    """
+    Yield positions of random games, restarting when a game ends.
+
+    Args:
+        seed (int): Seed for the pieces and moves.
+        grid_type (str): "standard" or "bitboard".
+        count (int): Number of positions.
+
+    Yields:
+        TetrisEnv: The live environment.
+    """
+    rng = random.Random(seed)
+    env = TetrisEnv(20, 10, "classic", seed, grid_type=grid_type)
+    for _ in range(count):
+        if env.game_over:
+            env.reset()
+        yield env
+        env.apply_move(rng.choice(env.get_possible_moves()))
+
+
+def test_batched_features_match_scalar_features():
+    for grid_type in ("standard", "bitboard"):
+        for env in random_positions(0, grid_type):
+            for moves in (env.get_possible_moves(), env.get_reachable_placements()):
+                features = compute_batch_features(build_afterstates(env, moves))
+                scores = evaluate_moves(env, moves, WEIGHTS)
+                assert features.shape == (len(moves), 4)
+                for move, row, score in zip(moves, features, scores):
+                    after = env.simulate_move(move)
+                    assert row.tolist() == scalar_features(after)
+                    assert np.isclose(score, evaluate_state(after, WEIGHTS))
+
+
+def test_batched_features_after_line_clears():
+    # Three rows missing only column 0, a fourth with a covered hole, an
+    # overhang and a tall column; a vertical I in column 0 clears three rows.
+    bits = [0] * 12 + [0b0000100000, 0b0000100000, 0b0110101100, 0b0000000110,
+                       0b1111111110, 0b1111111110, 0b1011111110, 0b1111111110]
+    source = TetrisEnv(20, 10, "classic", 0, grid_type="bitboard", track_features=True)
+    source.grid.load_bits(bits)
+    for grid_type in ("standard", "bitboard"):
+        env = TetrisEnv.from_encoding(source.encode(), grid_type=grid_type)
+        for shape in ("I", "O", "T", "L"):
+            env.current_piece.shape = shape
+            env.current_piece.rotation_index = 0
+            moves = env.get_possible_moves()
+            features = compute_batch_features(build_afterstates(env, moves))
+            for move, row in zip(moves, features):
+                assert row.tolist() == scalar_features(env.simulate_move(move))
+            if shape == "I":
+                assert features[:, 1].max() == 3
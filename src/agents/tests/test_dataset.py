@@ -0,0 +1,49 @@
+import glob
+import json
+import os
+
+import numpy as np
+
+from src.agents.dataset import generate_dataset
+from src.agents.features import DEFAULT_FEATURES
+
+WEIGHTS = [-0.51192248, 0.76122771, -0.35380663, -0.18245166]
+
+
+def load_shards(out_dir):
+    """
+    Load and concatenate every shard of a dataset.
+
+    Args:
+        out_dir (str): Dataset directory.
+
+    Returns:
+        list[dict]: Arrays of each shard, keyed by name.
+    """
+    shards = []
+    for path in sorted(glob.glob(os.path.join(out_dir, "*-*"))):
+        shards.append({name: np.load(os.path.join(path, f"{name}.npy"))
+                       for name in ("boards", "pieces", "offsets", "placements", "features", "chosen")})
+    return shards
+
+
+def test_chosen_move_is_the_best_scored_candidate(tmp_path):
+    out_dir = str(tmp_path)
+    n_examples = generate_dataset(out_dir, WEIGHTS, n_games=2, max_pieces=40, rows=20, seed=3,
+                                  shard_size=25, workers=1)
+    with open(os.path.join(out_dir, "meta.json")) as f:
+        meta = json.load(f)
+    assert meta["n_examples"] == n_examples
+    assert meta["features"] == list(DEFAULT_FEATURES)
+
+    shards = load_shards(out_dir)
+    assert sum(len(shard["chosen"]) for shard in shards) == n_examples
+    assert all(len(shard["chosen"]) <= 25 for shard in shards)
+    for shard in shards:
+        offsets = shard["offsets"]
+        assert shard["boards"].shape == (len(shard["chosen"]), 20)
+        assert offsets[-1] == len(shard["features"]) == len(shard["placements"])
+        for example, chosen in enumerate(shard["chosen"]):
+            scores = shard["features"][offsets[example]:offsets[example + 1]] @ np.float32(WEIGHTS)
+            # float32 storage can reorder near ties, so compare scores.
+            assert scores[chosen] >= scores.max() - 1e-4
@@ -0,0 +1,143 @@
+import random
+
+import pytest
+
+from src.env.env import TetrisEnv, Move
+from src.env.piece import Piece
+from src.agents.agent import TetrisAgent
+from src.agents.features import FEATURES, FeatureSet, register_feature, scan_board
+from src.agents.reward import evaluate_state
+
+WEIGHTS = [-0.51192248, 0.76122771, -0.35380663, -0.18245166]
+
+
+def naive_features(grid):
+    """
+    Compute the board features cell by cell, as the scan_board docstring defines them.
+
+    Args:
+        grid: Grid or BitboardGrid instance.
+
+    Returns:
+        dict: Feature name -> value.
+    """
+    rows, cols = grid.rows, grid.cols
+    board = [[1 if cell else 0 for cell in row] for row in grid.board]
+    heights = [0] * cols
+    holes = column_transitions = 0
+    for x in range(cols):
+        column = [board[y][x] for y in range(rows)]
+        if 1 in column:
+            top = column.index(1)
+            heights[x] = rows - top
+            holes += column[top:].count(0)
+        cells = [0] + column + [1]
+        column_transitions += sum(cells[i] != cells[i + 1] for i in range(rows + 1))
+    row_transitions = 0
+    for row in board:
+        cells = [1] + row + [1]
+        row_transitions += sum(cells[i] != cells[i + 1] for i in range(cols + 1))
+    wells = cumulative_wells = 0
+    for x in range(cols):
+        depth = 0
+        for y in range(rows - heights[x]):
+            left = board[y][x - 1] if x > 0 else 1
+            right = board[y][x + 1] if x < cols - 1 else 1
+            if left and right:
+                depth += 1
+                wells += 1
+                cumulative_wells += depth
+            else:
+                depth = 0
+    return {
+        "aggregate_height": sum(heights),
+        "lines_cleared": grid.lines_cleared,
+        "holes": holes,
+        "bumpiness": sum(abs(heights[i] - heights[i + 1]) for i in range(cols - 1)),
+        "max_height": max(heights),
+        "row_transitions": row_transitions,
+        "column_transitions": column_transitions,
+        "wells": wells,
+        "cumulative_wells": cumulative_wells,
+        "landing_height": grid.landing_height,
+    }
+
+
+def random_states(seed, count=400):
+    """
+    Yield afterstates of random play on both grid types.
+
+    Args:
+        seed (int): Seed for the pieces and moves.
+        count (int): Number of states per grid type.
+
+    Yields:
+        TetrisEnv: An afterstate.
+    """
+    rng = random.Random(seed)
+    for grid_type in ("standard", "bitboard"):
+        env = TetrisEnv(20, 10, "classic", seed, grid_type=grid_type, track_features=True)
+        for _ in range(count):
+            if env.game_over:
+                env.reset()
+            placements = env.get_reachable_placements()
+            state = env.simulate_move(rng.choice(placements))
+            yield state
+            env = state if not state.game_over else env
+
+
+def test_scan_matches_naive_features():
+    names = list(FEATURES)
+    features = FeatureSet(names)
+    for state in random_states(0):
+        expected = naive_features(state.grid)
+        assert features.vector(state).tolist() == [expected[name] for name in names]
+
+
+def test_scan_board_heights():
+    for state in random_states(1, count=100):
+        assert scan_board(state.grid).heights == state.grid.get_column_heights()
+
+
+def test_default_features_match_evaluate_state():
+    features = FeatureSet()
+    for state in random_states(2, count=200):
+        assert features.score(state, WEIGHTS) == pytest.approx(evaluate_state(state, WEIGHTS))
+
+
+def test_registered_feature_is_available():
+    @register_feature("test_filled_cells")
+    def filled_cells(grid, scan):
+        return sum(bin(row).count("1") for row in grid.board_key())
+
+    try:
+        features = FeatureSet(["holes", "test_filled_cells"])
+        state = next(random_states(3))
+        assert features.vector(state)[1] == sum(bin(row).count("1") for row in state.grid.board_key())
+    finally:
+        del FEATURES["test_filled_cells"]
+
+
+def test_unknown_feature_raises():
+    with pytest.raises(ValueError):
+        FeatureSet(["holes", "no_such_feature"])
+
+
+def test_cached_evaluation_tracks_landing_height():
+    names = ["aggregate_height", "holes", "landing_height"]
+    weights = [-0.5, -0.3, -1.0]
+    features = FeatureSet(names)
+    agent = TetrisAgent(None, weights, "promax", features=names)
+    left = -Piece("O").info.min_col
+    states = []
+    # The same board, finished by an O landing high or low.
+    for order in ((left, left, left + 2), (left, left + 2, left)):
+        env = TetrisEnv(20, 10, "classic", 0, grid_type="bitboard", track_features=True)
+        for x in order:
+            env.current_piece = Piece("O")
+            env.apply_move(Move(0, x))
+        states.append(env)
+    assert states[0].grid.board_key() == states[1].grid.board_key()
+    assert states[0].grid.landing_height != states[1].grid.landing_height
+    for state in states + list(random_states(4, count=200)):
+        assert agent.evaluate_cached(state) == pytest.approx(features.score(state, weights))
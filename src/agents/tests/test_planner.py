@@ -0,0 +1,56 @@
+import time
+
+from src.agents.agent import TetrisAgent
+from src.agents.planner import BackgroundPlanner
+from src.env.env import TetrisEnv
+
+WEIGHTS = [-0.51192248, 0.76122771, -0.35380663, -0.18245166]
+
+
+def wait_for_move(planner, env, timeout=30.0):
+    """
+    Poll the planner like the UI loop until it answers.
+
+    Args:
+        planner (BackgroundPlanner): Planner to poll.
+        env: Live environment.
+        timeout (float): Seconds to wait before giving up.
+
+    Returns:
+        Move: The planned move.
+    """
+    end = time.perf_counter() + timeout
+    while time.perf_counter() < end:
+        move = planner.poll(env)
+        if move is not None:
+            return move
+        time.sleep(0.001)
+    raise AssertionError("The planner did not answer in time.")
+
+
+def test_planned_moves_match_a_direct_search():
+    for generator in ("classic", "random"):
+        env = TetrisEnv(20, 10, generator, 8, grid_type="bitboard", track_features=True)
+        planner = BackgroundPlanner(TetrisAgent(None, WEIGHTS, "expectimax", search_depth=2))
+        reference = TetrisAgent(env, WEIGHTS, "expectimax", search_depth=2)
+        try:
+            # The first position is a miss: it is only queued by the first poll.
+            assert planner.poll(env) is None
+            for _ in range(15):
+                move = wait_for_move(planner, env)
+                assert move == reference.get_best_move()
+                env.apply_move(move)
+        finally:
+            assert planner.close()
+
+
+def test_close_cancels_the_running_search():
+    env = TetrisEnv(20, 10, "classic", 9, grid_type="bitboard", track_features=True)
+    agent = TetrisAgent(None, WEIGHTS, "expectimax", search_depth=6, beam_width=34, min_probability=0)
+    planner = BackgroundPlanner(agent)
+    planner.poll(env)
+    time.sleep(0.05)
+    start = time.perf_counter()
+    assert planner.close(timeout=5.0)
+    assert time.perf_counter() - start < 1.0
+    assert agent.stop_event is None
@@ -0,0 +1,25 @@
+import pytest
+
+from src.agents.trainer import train, load_checkpoint
+
+WEIGHTS = [-0.51192248, 0.76122771, -0.35380663, -0.18245166]
+SETTINGS = dict(population=4, sigma=0.1, alpha=0.01, games_per_member=1, max_pieces=40,
+                rows=20, cols=10, seed=5, workers=1)
+
+
+def test_resumed_run_matches_an_uninterrupted_one(tmp_path):
+    uninterrupted = train(WEIGHTS, generations=3, **SETTINGS)
+    checkpoint_dir = str(tmp_path)
+    train(WEIGHTS, generations=2, checkpoint_dir=checkpoint_dir, **SETTINGS)
+    assert load_checkpoint(checkpoint_dir)["generation"] == 1
+    resumed = train(WEIGHTS, generations=3, checkpoint_dir=checkpoint_dir, **SETTINGS)
+    assert resumed.tolist() == uninterrupted.tolist()
+    assert load_checkpoint(checkpoint_dir)["config"]["sigma"] == SETTINGS["sigma"]
+
+
+def test_resume_rejects_different_settings(tmp_path):
+    checkpoint_dir = str(tmp_path)
+    train(WEIGHTS, generations=1, checkpoint_dir=checkpoint_dir, **SETTINGS)
+    changed = dict(SETTINGS, sigma=0.2, population=6)
+    with pytest.raises(ValueError, match="population, sigma"):
+        train(WEIGHTS, generations=2, checkpoint_dir=checkpoint_dir, **changed)
@@ -0,0 +1,51 @@
+import pytest
+
+from src.agents.agent import TetrisAgent
+from src.agents.transposition import TranspositionTable
+from src.env.env import TetrisEnv
+
+WEIGHTS = [-0.51192248, 0.76122771, -0.35380663, -0.18245166]
+
+
+def test_evicts_the_least_recently_used_entry():
+    table = TranspositionTable(3)
+    for key in "abc":
+        table.put(key, key.upper())
+    assert table.get("a") == "A"
+    table.put("b", "B2")
+    table.put("d", "D")
+    # "c" was used longest ago: "a" was read and "b" rewritten since.
+    assert list(table.entries) == ["a", "b", "d"]
+    table.put("e", "E")
+    assert list(table.entries) == ["b", "d", "e"]
+    assert len(table) == 3
+    assert table.get("b") == "B2"
+
+
+def test_counts_hits_and_misses():
+    table = TranspositionTable(2)
+    assert table.get("a") is None
+    table.put("a", 0.0)
+    assert table.get("a") == 0.0
+    assert table.get("a") == 0.0
+    assert table.get("b") is None
+    assert (table.hits, table.misses) == (2, 2)
+    table.clear()
+    assert (len(table), table.hits, table.misses) == (0, 0, 0)
+
+
+def test_changing_weights_drops_cached_scores():
+    env = TetrisEnv(20, 10, "classic", 0, grid_type="bitboard", track_features=True)
+    agent = TetrisAgent(env, WEIGHTS, "promax")
+    state = env.simulate_move(env.get_possible_moves()[0])
+    score = agent.evaluate_cached(state)
+    agent.get_best_move()
+    assert len(agent.table) > 0
+    agent.weights = [2 * w for w in WEIGHTS]
+    assert len(agent.table) == 0
+    assert agent.evaluate_cached(state) == pytest.approx(2 * score)
+    agent.features = ["aggregate_height", "lines_cleared", "holes", "bumpiness"]
+    assert len(agent.table) == 0
+    assert agent.evaluate_cached(state) == pytest.approx(2 * score)
+    agent.weights = WEIGHTS
+    assert agent.evaluate_cached(state) == pytest.approx(score)
@@ -0,0 +1,178 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.env.env import TetrisEnv
+from src.agents.agent import TetrisAgent
+
+
+def play_game(weights, seed, max_pieces=500, rows=22, cols=10, strategy="normal"):
+    """
+    Play one headless game with the agent.
+
+    Args:
+        weights (np.array): Weight vector for state evaluation.
+        seed: Seed for the piece generator.
+        max_pieces (int): Maximum number of pieces before stopping.
+        rows (int): Number of grid rows.
+        cols (int): Number of grid columns.
+        strategy (str): Agent mode.
+
+    Returns:
+        int: Lines cleared in the game.
+    """
+    env = TetrisEnv(rows, cols, "classic", seed, grid_type="bitboard", track_features=True)
+    agent = TetrisAgent(env, weights, strategy)
+    for _ in range(max_pieces):
+        if env.game_over:
+            break
+        move = agent.get_best_move()
+        if move is None:
+            break
+        env.apply_move(move)
+    return env.score
+
+
+def member_noise(noise_seed, member, size):
+    """
+    Regenerate the Gaussian noise of a population member from the shared seed.
+
+    Args:
+        noise_seed (int): Seed shared by the whole generation.
+        member (int): Index of the population member.
+        size (int): Length of the weight vector.
+
+    Returns:
+        np.ndarray: Noise vector drawn from Normal(0, 1).
+    """
+    return np.random.default_rng([noise_seed, member]).standard_normal(size)
+
+
+def evaluate_member(task):
+    """
+    Evaluate one perturbed weight vector; runs inside a pool worker.
+
+    Args:
+        task (tuple): (weights, sigma, noise_seed, member, game_seeds, max_pieces, rows, cols).
+
+    Returns:
+        float: Mean lines cleared over the games.
+    """
+    weights, sigma, noise_seed, member, game_seeds, max_pieces, rows, cols = task
+    candidate = np.asarray(weights) + sigma * member_noise(noise_seed, member, len(weights))
+    scores = [play_game(candidate, seed, max_pieces, rows, cols) for seed in game_seeds]
+    return float(np.mean(scores))
+
+
+def save_checkpoint(checkpoint_dir, state):
+    """
+    Save the trainer state for one generation.
+
+    Args:
+        checkpoint_dir (str): Directory for checkpoint files.
+        state (dict): Trainer state.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = os.path.join(checkpoint_dir, f"generation_{state['generation']:04d}.json")
+    with open(path, "w") as f:
+        json.dump(state, f, indent=2)
+    with open(os.path.join(checkpoint_dir, "latest.json"), "w") as f:
+        json.dump(state, f, indent=2)
+
+
+def load_checkpoint(checkpoint_dir):
+    """
+    Load the latest trainer state.
+
+    Args:
+        checkpoint_dir (str): Directory for checkpoint files.
+
+    Returns:
+        dict: Trainer state, or None if there is no checkpoint.
+    """
+    path = os.path.join(checkpoint_dir, "latest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def train(initial_weights, generations=50, population=50, sigma=0.1, alpha=0.01,
+          games_per_member=3, max_pieces=500, rows=22, cols=10, seed=0,
+          workers=None, checkpoint_dir=None):
+    """
+    Train evaluation weights with the evolution strategy from the README.
+
+    Each generation perturbs the weights with Gaussian noise, scores every
+    member in a process pool, and applies
+    ``w_new = w_old + alpha / (sigma * N) * sum(noise_i * Z_i)``.
+    Workers only receive the noise seed and member index and only send back
+    the fitness, so the noise never crosses process boundaries.
+
+    Args:
+        initial_weights (list[float]): Starting weight vector.
+        generations (int): Number of generations.
+        population (int): Population size N.
+        sigma (float): Noise factor.
+        alpha (float): Learning rate.
+        games_per_member (int): Games played per member.
+        max_pieces (int): Piece limit per game.
+        rows (int): Number of grid rows.
+        cols (int): Number of grid columns.
+        seed (int): Base seed for noise and piece sequences.
+        workers (int): Number of worker processes (defaults to CPU count).
+        checkpoint_dir (str): Directory to save and resume checkpoints from.
+            A run only resumes from a checkpoint written with the same
+            settings (all but generations and workers).
+
+    Returns:
+        np.ndarray: The trained weight vector.
+
+    Raises:
+        ValueError: If the checkpoint was written with different settings.
+    """
+    weights = np.asarray(initial_weights, dtype=float)
+    # Settings a resumed run must share with the checkpoint to continue the
+    # same noise and game sequence.
+    config = {"population": population, "sigma": sigma, "alpha": alpha,
+              "games_per_member": games_per_member, "max_pieces": max_pieces,
+              "rows": rows, "cols": cols, "seed": seed}
+    start = 0
+    if checkpoint_dir:
+        state = load_checkpoint(checkpoint_dir)
+        if state is not None:
+            saved = state.get("config", {})
+            mismatched = sorted(key for key in config if saved.get(key) != config[key])
+            if mismatched:
+                raise ValueError(f"Checkpoint in {checkpoint_dir} was written with different settings "
+                                 f"({', '.join(mismatched)}); use another checkpoint directory.")
+            weights = np.asarray(state["weights"], dtype=float)
+            start = state["generation"] + 1
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for generation in range(start, generations):
+            noise_seed = seed * 1_000_003 + generation
+            game_seeds = [noise_seed * games_per_member + i for i in range(games_per_member)]
+            tasks = [(weights.tolist(), sigma, noise_seed, member, game_seeds, max_pieces, rows, cols)
+                     for member in range(population)]
+            fitness = np.array(list(pool.map(evaluate_member, tasks)))
+
+            std = fitness.std()
+            z_scores = (fitness - fitness.mean()) / std if std > 0 else np.zeros(population)
+            step = sum(member_noise(noise_seed, member, len(weights)) * z_scores[member]
+                       for member in range(population))
+            weights = weights + alpha / (sigma * population) * step
+
+            print(f"Generation {generation}: mean {fitness.mean():.2f}, max {fitness.max():.2f}, "
+                  f"weights {np.round(weights, 5).tolist()}")
+            if checkpoint_dir:
+                save_checkpoint(checkpoint_dir, {
+                    "generation": generation,
+                    "config": config,
+                    "weights": weights.tolist(),
+                    "mean_fitness": float(fitness.mean()),
+                    "max_fitness": float(fitness.max()),
+                })
+    return weights
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+
+
+class TranspositionTable:
+    """Bounded LRU cache for search results keyed by board position."""
+
+    def __init__(self, max_size=200000):
+        """
+        Initialize the table.
+
+        Args:
+            max_size (int): Maximum number of entries before the least
+                recently used ones are evicted.
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key: Hashable position key.
+
+        Returns:
+            The stored value, or None if absent.
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key: Hashable position key.
+            value: Value to store (must not be None).
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,220 @@
+from src.env.grid import Grid
+from src.env.piece import PIECE_TABLE
+
+# Color shown for cells loaded without color information.
+UNKNOWN_COLOR = (160, 160, 160)
+
+
+class BitboardGrid(Grid):
+    """
+    Tetris grid storing each row as an integer bitmask.
+
+    Bit ``x`` of ``bits[y]`` is set when cell ``(x, y)`` is occupied. The
+    RGB color layer is only kept when ``track_colors`` is True (needed for
+    rendering); simulation-only grids can skip it.
+    """
+
+    def __init__(self, rows=20, cols=10, track_colors=True, track_features=False):
+        """
+        Initialize the grid.
+
+        Args:
+            rows (int): Number of rows.
+            cols (int): Number of columns.
+            track_colors (bool): Whether to keep the color layer.
+            track_features (bool): Whether to maintain column heights, column
+                hole counts and row fill counts incrementally.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.track_colors = track_colors
+        self.track_features = track_features
+        self.full_mask = (1 << cols) - 1
+        self.lines_cleared = 0
+        # Height above the floor of the middle of the last placed piece.
+        self.landing_height = 0
+        # Incremented whenever the board contents change.
+        self.version = 0
+        self.bits = [0] * rows
+        self.colors = [[0] * cols for _ in range(rows)] if track_colors else None
+        self._reset_features()
+
+    @property
+    def board(self):
+        """
+        Get the board as a list of rows.
+
+        Returns:
+            list[list]: Piece colors when colors are tracked, 0/1 otherwise.
+        """
+        if self.colors is not None:
+            return self.colors
+        return [[(row >> x) & 1 for x in range(self.cols)] for row in self.bits]
+
+    def clone(self):
+        """
+        Clone the grid.
+
+        Returns:
+            BitboardGrid: A cloned grid instance.
+        """
+        new_grid = BitboardGrid.__new__(BitboardGrid)
+        new_grid.rows = self.rows
+        new_grid.cols = self.cols
+        new_grid.track_colors = self.track_colors
+        new_grid.full_mask = self.full_mask
+        new_grid.lines_cleared = self.lines_cleared
+        new_grid.landing_height = self.landing_height
+        new_grid.version = self.version
+        new_grid.bits = self.bits[:]
+        new_grid.colors = [row[:] for row in self.colors] if self.colors is not None else None
+        self._copy_features(new_grid)
+        return new_grid
+
+    def load_bits(self, bits, colors=None):
+        """
+        Replace the board contents with the given row bitmasks.
+
+        Args:
+            bits (Sequence[int]): One bitmask per row.
+            colors (list[list], optional): Color layer to use when colors are
+                tracked; occupied cells default to gray when omitted.
+        """
+        self.bits = [int(row) & self.full_mask for row in bits]
+        if self.colors is not None:
+            if colors is not None:
+                self.colors = [row[:] for row in colors]
+            else:
+                self.colors = [[UNKNOWN_COLOR if (row >> x) & 1 else 0 for x in range(self.cols)]
+                               for row in self.bits]
+        self._rebuild_features()
+
+    def _is_filled(self, x, y):
+        """
+        Check whether a cell is occupied.
+
+        Args:
+            x (int): Column.
+            y (int): Row.
+
+        Returns:
+            bool: True if occupied.
+        """
+        return bool((self.bits[y] >> x) & 1)
+
+    def is_valid_position(self, piece):
+        """
+        Check if the piece is in a valid position.
+
+        Args:
+            piece (Piece): Tetris piece.
+
+        Returns:
+            bool: True if valid, False otherwise.
+        """
+        info = PIECE_TABLE[piece.shape][piece.rotation_index]
+        x = piece.x
+        if x + info.min_col < 0 or x + info.max_col >= self.cols:
+            return False
+        bits = self.bits
+        y = piece.y
+        for mask in info.row_masks:
+            if mask:
+                if not 0 <= y < self.rows:
+                    return False
+                if bits[y] & (mask << x if x >= 0 else mask >> -x):
+                    return False
+            y += 1
+        return True
+
+    def place_piece(self, piece):
+        """
+        Place the piece on the grid.
+
+        Args:
+            piece (Piece): Tetris piece.
+        """
+        x = piece.x
+        bits = self.bits
+        y = piece.y
+        for mask in PIECE_TABLE[piece.shape][piece.rotation_index].row_masks:
+            if mask and 0 <= y < self.rows:
+                bits[y] |= (mask << x if x >= 0 else mask >> -x) & self.full_mask
+            y += 1
+        if self.colors is not None or self.track_features:
+            for cx, cy in piece.get_cells():
+                if 0 <= cy < self.rows and 0 <= cx < self.cols:
+                    if self.colors is not None:
+                        self.colors[cy][cx] = piece.color
+                    if self.track_features:
+                        self._add_cell(cx, cy)
+        if not self.track_features:
+            self._heights = None
+        info = piece.info
+        self.landing_height = self.rows - piece.y - (info.min_row + info.max_row) / 2
+        self.version += 1
+        self.lines_cleared = self.clear_lines()
+
+    def clear_lines(self):
+        """
+        Clear complete lines in the grid.
+
+        Returns:
+            int: Number of lines cleared.
+        """
+        full = self.full_mask
+        if full not in self.bits:
+            return 0
+        kept = [y for y, row in enumerate(self.bits) if row != full]
+        lines_cleared = self.rows - len(kept)
+        if self.track_features:
+            self._remove_rows([y for y, row in enumerate(self.bits) if row == full])
+        else:
+            self._heights = None
+        self.bits = [0] * lines_cleared + [self.bits[y] for y in kept]
+        if self.colors is not None:
+            self.colors = ([[0] * self.cols for _ in range(lines_cleared)] +
+                           [self.colors[y] for y in kept])
+        return lines_cleared
+
+    def reset(self):
+        """Reset the grid to the initial state."""
+        self.lines_cleared = 0
+        self.landing_height = 0
+        self.version += 1
+        self.bits = [0] * self.rows
+        self._reset_features()
+        if self.colors is not None:
+            self.colors = [[0] * self.cols for _ in range(self.rows)]
+
+    def board_key(self):
+        """
+        Get a hashable key identifying the occupied cells of the board.
+
+        Returns:
+            tuple[int]: The row bitmasks.
+        """
+        return tuple(self.bits)
+
+    def get_column_heights(self):
+        """
+        Get the height of each column, tracked or cached until the board changes.
+
+        Returns:
+            list[int]: Column heights; treat as read-only.
+        """
+        if self._heights is None:
+            heights = [0] * self.cols
+            seen = 0
+            for y, row in enumerate(self.bits):
+                new = row & ~seen
+                if new:
+                    seen |= new
+                    while new:
+                        low = new & -new
+                        heights[low.bit_length() - 1] = self.rows - y
+                        new ^= low
+                    if seen == self.full_mask:
+                        break
+            self._heights = heights
+        return self._heights
@@ -1,12 +1,25 @@
+from collections import namedtuple
+
 from src.env.grid import Grid
-from src.env.random_piece_generator import random_piece_generator, generate_7_bag
+from src.env.bitboard import BitboardGrid
+from src.env.random_piece_generator import PieceStream
 from src.env.piece import Piece
+from src.env.move_generator import Placement, find_reachable_placements
 from src.utils.config import gravity_rate
 
+# A placement: rotate the current piece `rotations` times clockwise, shift it
+# to column `x`, then hard drop.
+Move = namedtuple("Move", ["rotations", "x"])
+
 class TetrisEnv:
     """Tetris game environment class."""
 
-    def __init__(self, rows=20, cols=10, generator="classic", seed=None, level=0):
+    # Object notified of locks and swaps (see ``src.env.replay.ReplayRecorder``).
+    # Clones never inherit it, so simulated moves are not recorded.
+    recorder = None
+
+    def __init__(self, rows=20, cols=10, generator="classic", seed=None, level=0, grid_type="standard",
+                 track_features=False):
         """
         Initialize the Tetris environment.
 
@@ -14,14 +27,22 @@ class TetrisEnv:
             rows (int): Number of grid rows.
             cols (int): Number of grid columns.
             generator (str): "random" or "classic" generator.
-            seed: Seed for random generation.
+            seed: Seed of the piece sequence; the same seed always deals the
+                same pieces. None picks a random one.
+            grid_type (str): "standard" (list of rows) or "bitboard" grid.
+            track_features (bool): Whether the grid maintains evaluation features incrementally.
         """
         self.rows = rows
         self.cols = cols
         self.generator = generator
         self.seed = seed
         self.level = level
-        self.grid = Grid(rows, cols)
+        if grid_type == "standard":
+            self.grid = Grid(rows, cols, track_features=track_features)
+        elif grid_type == "bitboard":
+            self.grid = BitboardGrid(rows, cols, track_features=track_features)
+        else:
+            raise ValueError(f"Grid type {grid_type} is not defined.")
         self.score = 0
         self.moves_played = 0
         self.timing = 0
@@ -30,15 +51,16 @@ class TetrisEnv:
 
 
     def _init_pieces(self):
-        """Initialize current and next pieces."""
+        """Initialize the piece stream and the current and next pieces."""
+        self.piece_stream = PieceStream(self.seed, self.generator)
         if self.generator == "random":
-            self.current_piece = random_piece_generator(seed=self.seed)
-            self.next_piece = random_piece_generator()
+            self.current_piece = Piece(self.piece_stream.next_shape())
+            self.next_piece = Piece(self.piece_stream.next_shape())
         elif self.generator == "classic":
-            self.current_bag = generate_7_bag(seed=self.seed)
+            self.current_bag = self.piece_stream.next_bag()
             self.current_piece = Piece(self.current_bag.pop())
             if not self.current_bag:
-                self.current_bag = generate_7_bag()
+                self.current_bag = self.piece_stream.next_bag()
             self.next_piece = Piece(self.current_bag.pop())
 
     def reset(self):
@@ -59,6 +81,7 @@ class TetrisEnv:
         new_env = TetrisEnv.__new__(TetrisEnv)
         new_env.generator = self.generator
         new_env.seed = self.seed
+        new_env.piece_stream = self.piece_stream.clone()
         new_env.grid = self.grid.clone()
         new_env.current_piece = self.current_piece.clone()
         new_env.next_piece = self.next_piece.clone()
@@ -68,15 +91,47 @@ class TetrisEnv:
             new_env.current_bag = self.current_bag.copy() if hasattr(self, 'current_bag') else []
         return new_env
 
+    def encode(self, colors=True):
+        """
+        Encode the game state as bytes (see ``src.env.serialization``).
+
+        Args:
+            colors (bool): Whether to store the color layer when the grid has one.
+
+        Returns:
+            bytes: The encoded state.
+        """
+        from src.env.serialization import encode_env
+        return encode_env(self, colors)
+
+    @classmethod
+    def from_encoding(cls, data, track_features=True, track_colors=None, grid_type="bitboard"):
+        """
+        Rebuild an environment from ``encode()`` output.
+
+        Args:
+            data (bytes-like): Encoded state.
+            track_features (bool): Whether the grid tracks features incrementally.
+            track_colors (bool): Whether a bitboard grid keeps a color layer;
+                defaults to whether the encoding has one.
+            grid_type (str): "standard" or "bitboard" grid.
+
+        Returns:
+            TetrisEnv: The decoded environment, an instance of ``cls``. Timing is reset.
+        """
+        # serialization imports this module, so import it on first use.
+        from src.env.serialization import decode_env
+        return decode_env(data, grid_type, track_colors, track_features, env_class=cls)
+
     def new_piece(self):
         """Update the environment with a new piece."""
         self.current_piece = self.next_piece
         self.current_piece.x = (self.grid.cols - self.current_piece.piece_width) // 2
         if self.generator == "random":
-            self.next_piece = random_piece_generator()
+            self.next_piece = Piece(self.piece_stream.next_shape())
         elif self.generator == "classic":
             if not self.current_bag:
-                self.current_bag = generate_7_bag()
+                self.current_bag = self.piece_stream.next_bag()
             self.next_piece = Piece(self.current_bag.pop())
         if not self.grid.is_valid_position(self.current_piece):
             self.game_over = True
@@ -147,34 +202,78 @@ class TetrisEnv:
         self.next_piece = temp_piece
         self.next_piece.x = (self.grid.cols - self.current_piece.piece_width) // 2
         self.next_piece.y = 0
+        if self.recorder is not None:
+            self.recorder.record_swap(self)
         return True
 
+    def lock_piece(self):
+        """Place the current piece on the grid where it is and spawn the next one."""
+        if self.recorder is not None:
+            self.recorder.record_lock(self, self.current_piece)
+        self.grid.place_piece(self.current_piece)
+        self.score += self.grid.lines_cleared
+        if not self.game_over:
+            self.new_piece()
+
     def drop_piece(self):
         """Drop the piece by one unit; if unable, place it on the grid."""
         if not self.move_piece(0, 1):
-            self.grid.place_piece(self.current_piece)
-            self.score += self.grid.lines_cleared
-            if not self.game_over:
-                self.new_piece()
+            self.lock_piece()
 
     def hard_drop(self):
         """Perform a hard drop."""
-        while self.move_piece(0, 1):
-            pass
-        self.drop_piece()
+        self.current_piece.y = self.grid.get_drop_y(self.current_piece)
+        self.lock_piece()
+
+    def apply_move(self, move):
+        """
+        Rotate and shift the current piece from its position, then hard drop it.
+
+        A Placement from ``get_reachable_placements`` is locked exactly where
+        it rests instead.
+
+        Args:
+            move (Move or Placement): Move description.
+
+        Returns:
+            bool: True if the move was applied, False if the target position is invalid.
+        """
+        piece = self.current_piece
+        if isinstance(move, Placement):
+            target = Piece(piece.shape, move.rotation_index, move.x, move.y)
+            if not self.grid.is_valid_position(target):
+                return False
+            self.current_piece = target
+            self.lock_piece()
+            return True
+        rotations, x = move
+        rotation_index = (piece.rotation_index + rotations) % len(piece.rotations)
+        target = Piece(piece.shape, rotation_index, x, piece.y)
+        if not self.grid.is_valid_position(target):
+            return False
+        target.y = self.grid.get_drop_y(target)
+        self.current_piece = target
+        self.lock_piece()
+        return True
 
     def get_ghost_piece(self):
         """
         Get the ghost (shadow) piece.
 
+        The landing row comes from the column heights and is cached on the
+        grid until the piece moves or the board changes.
+
         Returns:
-            Piece: The ghost piece.
+            Piece: The ghost piece; treat as read-only.
         """
-        ghost = self.current_piece.clone()
-        while self.grid.is_valid_position(ghost):
-            ghost.y += 1
-        ghost.y -= 1
-        return ghost
+        grid = self.grid
+        piece = self.current_piece
+        key = (grid.version, piece.shape, piece.rotation_index, piece.x, piece.y)
+        if grid.ghost_cache is None or grid.ghost_cache[0] != key:
+            ghost = piece.clone()
+            ghost.y = grid.get_drop_y(ghost)
+            grid.ghost_cache = (key, ghost)
+        return grid.ghost_cache[1]
 
     def update(self,dt):
         """Update the game state."""
@@ -202,44 +301,48 @@ class TetrisEnv:
         """
         Compute possible moves for the current piece.
 
+        Each distinct orientation is tried once (PIECE_TABLE holds no
+        repeated orientations), so every move lands on different cells.
+
         Returns:
-            list: List of move dictionaries.
+            list: List of Move tuples.
         """
         moves = []
-        original_piece = self.current_piece.clone()
-        for rotations in range(4):
-            piece_copy = original_piece.clone()
-            for _ in range(rotations):
-                piece_copy.rotate()
-            rel_cells = [(j, i) for i, row in enumerate(piece_copy.matrix) for j, val in enumerate(row) if val]
-            min_offset = min(j for j, _ in rel_cells)
-            max_offset = max(j for j, _ in rel_cells)
-            min_x = -min_offset
-            max_x = self.grid.cols - max_offset - 1
-            for x in range(min_x, max_x + 1):
-                test_piece = piece_copy.clone()
-                test_piece.x = x
-                if self.grid.is_valid_position(test_piece):
-                    moves.append({"rotations": rotations, "x": x})
+        piece = self.current_piece
+        rotations_table = piece.rotations
+        for rotations in range(len(rotations_table)):
+            rotation_index = (piece.rotation_index + rotations) % len(rotations_table)
+            info = rotations_table[rotation_index]
+            for x in range(-info.min_col, self.grid.cols - info.max_col):
+                if self.grid.is_valid_position(Piece(piece.shape, rotation_index, x, piece.y)):
+                    moves.append(Move(rotations, x))
         return moves
 
+    def get_reachable_placements(self):
+        """
+        Compute every resting placement reachable from the current piece's position.
+
+        Unlike ``get_possible_moves`` this follows real input paths, including
+        soft drops, slides and tucks under overhangs.
+
+        Returns:
+            list: List of Placement tuples with their shortest action sequences.
+        """
+        return find_reachable_placements(self.grid, self.current_piece)
+
     def simulate_move(self, move):
         """
         Simulate applying a move.
 
         Args:
-            move (dict): Move description.
+            move (Move or Placement): Move description.
 
         Returns:
             TetrisEnv: Cloned environment after applying the move, or None if invalid.
         """
         simulated_game = self.clone()
-        for _ in range(move["rotations"]):
-            simulated_game.current_piece.rotate()
-        simulated_game.current_piece.x = move["x"]
-        if not simulated_game.grid.is_valid_position(simulated_game.current_piece):
+        if not simulated_game.apply_move(move):
             return None
-        simulated_game.hard_drop()
         return simulated_game
 
     def get_gravity(self):
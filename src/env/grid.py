@@ -1,18 +1,129 @@
 class Grid:
     """Class representing the Tetris grid."""
 
-    def __init__(self, rows=20, cols=10):
+    # (board version, piece position) key and ghost piece of
+    # ``TetrisEnv.get_ghost_piece``. Kept on the grid so that a replaced grid
+    # takes its ghost with it; clones start without one.
+    ghost_cache = None
+
+    def __init__(self, rows=20, cols=10, track_features=False):
         """
         Initialize the grid.
 
         Args:
             rows (int): Number of rows.
             cols (int): Number of columns.
+            track_features (bool): Whether to maintain column heights, column
+                hole counts and row fill counts incrementally.
         """
         self.rows = rows
         self.cols = cols
+        self.track_features = track_features
         self.lines_cleared = 0
+        # Height above the floor of the middle of the last placed piece.
+        self.landing_height = 0
+        # Incremented whenever the board contents change.
+        self.version = 0
         self.board = [[0 for _ in range(cols)] for _ in range(rows)]
+        self._reset_features()
+
+    def _reset_features(self):
+        """Reset the feature counters for an empty board."""
+        if self.track_features:
+            self._heights = [0] * self.cols
+            self.column_holes = [0] * self.cols
+            self.row_fill = [0] * self.rows
+        else:
+            self._heights = None
+            self.column_holes = None
+            self.row_fill = None
+
+    def _copy_features(self, new_grid):
+        """
+        Copy the feature counters into a cloned grid.
+
+        Args:
+            new_grid (Grid): The clone.
+        """
+        new_grid.track_features = self.track_features
+        if self.track_features:
+            new_grid._heights = self._heights[:]
+            new_grid.column_holes = self.column_holes[:]
+            new_grid.row_fill = self.row_fill[:]
+        else:
+            # The cached heights are replaced, never mutated, so they can be shared.
+            new_grid._heights = self._heights
+            new_grid.column_holes = None
+            new_grid.row_fill = None
+
+    def _rebuild_features(self):
+        """Recompute the feature counters (or drop the cached heights) from the board."""
+        self.version += 1
+        self._reset_features()
+        if self.track_features:
+            for y in range(self.rows):
+                for x in range(self.cols):
+                    if self._is_filled(x, y):
+                        self._add_cell(x, y)
+
+    def _is_filled(self, x, y):
+        """
+        Check whether a cell is occupied.
+
+        Args:
+            x (int): Column.
+            y (int): Row.
+
+        Returns:
+            bool: True if occupied.
+        """
+        return bool(self.board[y][x])
+
+    def _add_cell(self, x, y):
+        """
+        Update the feature counters for a newly filled cell.
+
+        Args:
+            x (int): Column.
+            y (int): Row.
+        """
+        top = self.rows - self._heights[x]
+        if y < top:
+            # Every empty cell between the new block and the old top becomes a hole.
+            self.column_holes[x] += top - y - 1
+            self._heights[x] = self.rows - y
+        else:
+            self.column_holes[x] -= 1
+        self.row_fill[y] += 1
+
+    def _remove_rows(self, cleared):
+        """
+        Update the feature counters for full rows about to be removed.
+
+        Must be called before the rows are removed from the board.
+
+        Args:
+            cleared (list[int]): Indices of the full rows, ascending.
+        """
+        cleared_set = set(cleared)
+        for x in range(self.cols):
+            top = self.rows - self._heights[x]
+            if top not in cleared_set:
+                # All full rows lie below this column's top block.
+                self._heights[x] -= len(cleared)
+                continue
+            # The top block is removed: walk down to the next surviving block;
+            # the empty cells passed on the way are no longer holes.
+            y = top + 1
+            uncovered = 0
+            while y < self.rows and (y in cleared_set or not self._is_filled(x, y)):
+                if y not in cleared_set:
+                    uncovered += 1
+                y += 1
+            self.column_holes[x] -= uncovered
+            self._heights[x] = (self.rows - y) - sum(1 for row in cleared if row > y)
+        kept = [count for y, count in enumerate(self.row_fill) if y not in cleared_set]
+        self.row_fill = [0] * len(cleared) + kept
 
     def clone(self):
         """
@@ -21,9 +132,14 @@ class Grid:
         Returns:
             Grid: A cloned grid instance.
         """
-        new_grid = Grid(self.rows, self.cols)
+        new_grid = Grid.__new__(Grid)
+        new_grid.rows = self.rows
+        new_grid.cols = self.cols
         new_grid.board = [row[:] for row in self.board]
         new_grid.lines_cleared = self.lines_cleared
+        new_grid.landing_height = self.landing_height
+        new_grid.version = self.version
+        self._copy_features(new_grid)
         return new_grid
 
     def is_valid_position(self, piece):
@@ -51,6 +167,13 @@ class Grid:
         for x, y in piece.get_cells():
             if 0 <= y < self.rows and 0 <= x < self.cols:
                 self.board[y][x] = piece.color
+                if self.track_features:
+                    self._add_cell(x, y)
+        if not self.track_features:
+            self._heights = None
+        info = piece.info
+        self.landing_height = self.rows - piece.y - (info.min_row + info.max_row) / 2
+        self.version += 1
         self.lines_cleared = self.clear_lines()
 
     def clear_lines(self):
@@ -63,6 +186,10 @@ class Grid:
         new_board = [row for row in self.board if 0 in row]
         lines_cleared = self.rows - len(new_board)
         if lines_cleared:
+            if self.track_features:
+                self._remove_rows([y for y, row in enumerate(self.board) if 0 not in row])
+            else:
+                self._heights = None
             empty_rows = [[0] * self.cols for _ in range(lines_cleared)]
             self.board = empty_rows + new_board
         else:
@@ -72,7 +199,80 @@ class Grid:
     def reset(self):
         """Reset the grid to the initial state."""
         self.lines_cleared = 0
+        self.landing_height = 0
+        self.version += 1
         self.board = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
+        self._reset_features()
+
+    def board_key(self):
+        """
+        Get a hashable key identifying the occupied cells of the board.
+
+        Returns:
+            tuple[int]: One bitmask per row, bit x set for an occupied column x.
+        """
+        return tuple(sum(1 << x for x, cell in enumerate(row) if cell) for row in self.board)
+
+    def get_column_heights(self):
+        """
+        Get the height of each column, tracked or cached until the board changes.
+
+        Returns:
+            list[int]: Column heights; treat as read-only.
+        """
+        if self._heights is None:
+            heights = [0] * self.cols
+            for col in range(self.cols):
+                for row in range(self.rows):
+                    if self.board[row][col]:
+                        heights[col] = self.rows - row
+                        break
+            self._heights = heights
+        return self._heights
+
+    def get_drop_y(self, piece):
+        """
+        Get the row a valid piece lands on when hard dropped.
+
+        Uses the column heights and the piece's bottom profile, so the
+        landing row is found in one pass over the piece's columns. Falls
+        back to stepping down when the piece is already below the surface
+        of one of its columns (e.g. tucked under an overhang).
+
+        Args:
+            piece (Piece): Tetris piece.
+
+        Returns:
+            int: The landing y-coordinate.
+        """
+        info = piece.info
+        heights = self.get_column_heights()
+        col = piece.x + info.min_col
+        landing_y = self.rows
+        for bottom in info.bottom:
+            limit = self.rows - heights[col] - 1 - bottom
+            if limit < piece.y:
+                return self._step_drop_y(piece)
+            if limit < landing_y:
+                landing_y = limit
+            col += 1
+        return landing_y
+
+    def _step_drop_y(self, piece):
+        """
+        Get the landing row by moving the piece down one row at a time.
+
+        Args:
+            piece (Piece): Tetris piece.
+
+        Returns:
+            int: The landing y-coordinate.
+        """
+        probe = piece.clone()
+        probe.y += 1
+        while self.is_valid_position(probe):
+            probe.y += 1
+        return probe.y - 1
 
     def print_board(self):
         """Print the grid state."""
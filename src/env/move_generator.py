@@ -0,0 +1,115 @@
+from collections import deque, namedtuple
+
+from src.env.piece import PIECE_TABLE
+
+# A resting placement reachable from the piece's current position:
+# rotation index, x and y of the locked piece, and the shortest input
+# sequence leading there in the same action format the UI executes.
+Placement = namedtuple("Placement", ["rotation_index", "x", "y", "actions"])
+
+ROTATE_CW = ("rotate", True)
+ROTATE_CCW = ("rotate", False)
+MOVE_LEFT = ("move", -1)
+MOVE_RIGHT = ("move", 1)
+SOFT_DROP = ("down", None)
+HARD_DROP = ("drop", None)
+
+# Enough horizontal padding for any piece matrix hanging off either wall.
+_X_PAD = 4
+
+
+def move_actions(piece, move):
+    """
+    Compile the input sequence of a rotate-shift-drop move.
+
+    Args:
+        piece (Piece): The piece at the position the move starts from.
+        move (Move): Clockwise rotations and target column.
+
+    Returns:
+        tuple: Actions in the format of ``Placement.actions``.
+    """
+    rotations, x = move
+    dx = x - piece.x
+    shift = MOVE_RIGHT if dx > 0 else MOVE_LEFT
+    return (ROTATE_CW,) * rotations + (shift,) * abs(dx) + (HARD_DROP,)
+
+
+def find_reachable_placements(grid, piece):
+    """
+    Find every resting placement reachable by rotations, shifts and soft drops.
+
+    Runs a breadth-first search over (rotation, x, y) states starting from
+    the piece's position, using the same rules as ``TetrisEnv`` (rotation in
+    place without wall kicks, one-cell shifts and soft drops). Visited states
+    are kept in an integer bitset. A hard drop from each visited state is one
+    more input, so the first time a resting position is seen its sequence is
+    the shortest one. This includes tucks and spins under overhangs that
+    ``get_possible_moves`` cannot express.
+
+    Args:
+        grid: Grid or BitboardGrid instance.
+        piece (Piece): The piece in its current, valid position.
+
+    Returns:
+        list[Placement]: Reachable placements in order of sequence length.
+    """
+    rows, cols = grid.rows, grid.cols
+    bits = grid.board_key()
+    heights = grid.get_column_heights()
+    rotations = PIECE_TABLE[piece.shape]
+    n_rotations = len(rotations)
+    width = cols + 2 * _X_PAD
+
+    def is_valid(rotation_index, x, y):
+        info = rotations[rotation_index]
+        if x + info.min_col < 0 or x + info.max_col >= cols or y < 0:
+            return False
+        for mask in info.row_masks:
+            if mask:
+                if y >= rows or bits[y] & (mask << x if x >= 0 else mask >> -x):
+                    return False
+            y += 1
+        return True
+
+    def landing_y(rotation_index, x, y):
+        info = rotations[rotation_index]
+        landing = rows
+        col = x + info.min_col
+        for bottom in info.bottom:
+            limit = rows - heights[col] - 1 - bottom
+            if limit < y:
+                # Under an overhang: step down instead.
+                while is_valid(rotation_index, x, y + 1):
+                    y += 1
+                return y
+            landing = min(landing, limit)
+            col += 1
+        return landing
+
+    start = (piece.rotation_index, piece.x, piece.y)
+    visited = 1 << ((start[0] * (rows + 1) + start[2]) * width + start[1] + _X_PAD)
+    queue = deque([(start, ())])
+    placements = []
+    seen_rests = set()
+    while queue:
+        (rotation_index, x, y), path = queue.popleft()
+        rest = (rotation_index, x, landing_y(rotation_index, x, y))
+        if rest not in seen_rests:
+            seen_rests.add(rest)
+            placements.append(Placement(rest[0], rest[1], rest[2], path + (HARD_DROP,)))
+        for action, state in (
+                (MOVE_LEFT, (rotation_index, x - 1, y)),
+                (MOVE_RIGHT, (rotation_index, x + 1, y)),
+                (ROTATE_CW, ((rotation_index + 1) % n_rotations, x, y)),
+                (ROTATE_CCW, ((rotation_index - 1) % n_rotations, x, y)),
+                (SOFT_DROP, (rotation_index, x, y + 1))):
+            if not -_X_PAD <= state[1] < cols + _X_PAD or state[2] > rows:
+                continue
+            bit = 1 << ((state[0] * (rows + 1) + state[2]) * width + state[1] + _X_PAD)
+            if visited & bit:
+                continue
+            visited |= bit
+            if is_valid(*state):
+                queue.append((state, path + (action,)))
+    return placements
@@ -1,3 +1,5 @@
+from collections import namedtuple
+
 SHAPES = {
     'I': [
         [
@@ -122,25 +124,97 @@ SHAPES_COLORS = {
 }
 
 
+RotationInfo = namedtuple("RotationInfo", [
+    "matrix",     # tuple of row tuples
+    "cells",      # (dx, dy) offsets of occupied cells, row-major
+    "row_masks",  # per matrix row, bitmask with bit dx set for occupied cells
+    "min_col",
+    "max_col",
+    "min_row",
+    "max_row",
+    "width",
+    "height",
+    "bottom",     # per column min_col..max_col, the lowest occupied dy
+])
+
+
+def _build_rotation_info(matrix):
+    """
+    Precompute the geometry of one rotation of a shape.
+
+    Args:
+        matrix (list[list[int]]): Rotation matrix from SHAPES.
+
+    Returns:
+        RotationInfo: Immutable geometry record.
+    """
+    cells = tuple((j, i) for i, row in enumerate(matrix) for j, val in enumerate(row) if val)
+    min_col = min(dx for dx, _ in cells)
+    max_col = max(dx for dx, _ in cells)
+    min_row = min(dy for _, dy in cells)
+    max_row = max(dy for _, dy in cells)
+    return RotationInfo(
+        matrix=tuple(tuple(row) for row in matrix),
+        cells=cells,
+        row_masks=tuple(sum(1 << j for j, val in enumerate(row) if val) for row in matrix),
+        min_col=min_col,
+        max_col=max_col,
+        min_row=min_row,
+        max_row=max_row,
+        width=max_col - min_col + 1,
+        height=max_row - min_row + 1,
+        bottom=tuple(max(dy for dx, dy in cells if dx == col) for col in range(min_col, max_col + 1)),
+    )
+
+
+# Built once at import: shape -> tuple of RotationInfo, indexed by rotation.
+PIECE_TABLE = {
+    shape: tuple(_build_rotation_info(matrix) for matrix in rotations)
+    for shape, rotations in SHAPES.items()
+}
+
+
 class Piece:
     """Class representing a Tetris piece."""
 
-    def __init__(self, shape):
+    __slots__ = ("shape", "rotation_index", "x", "y")
+
+    def __init__(self, shape, rotation_index=0, x=3, y=0):
         """
         Initialize a Tetris piece.
 
         Args:
             shape (str): Identifier for the Tetris shape.
+            rotation_index (int): Index into the shape's rotations.
+            x (int): Column of the piece matrix's left edge.
+            y (int): Row of the piece matrix's top edge.
         """
         if shape not in SHAPES:
             raise ValueError(f"Shape {shape} is not defined.")
         self.shape = shape
-        self.color = SHAPES_COLORS[shape]
-        self.rotations = SHAPES[shape]
-        self.rotation_index = 0
-        self.matrix = [row[:] for row in self.rotations[self.rotation_index]]
-        self.x = 3
-        self.y = 0
+        self.rotation_index = rotation_index
+        self.x = x
+        self.y = y
+
+    @property
+    def color(self):
+        """RGB color of the piece."""
+        return SHAPES_COLORS[self.shape]
+
+    @property
+    def rotations(self):
+        """Precomputed rotations of the piece's shape."""
+        return PIECE_TABLE[self.shape]
+
+    @property
+    def info(self):
+        """RotationInfo for the current rotation."""
+        return PIECE_TABLE[self.shape][self.rotation_index]
+
+    @property
+    def matrix(self):
+        """Read-only matrix of the current rotation."""
+        return PIECE_TABLE[self.shape][self.rotation_index].matrix
 
     @property
     def piece_width(self):
@@ -150,22 +224,15 @@ class Piece:
         Returns:
             int: The width.
         """
-        rel_cells = [j for i, row in enumerate(self.matrix) for j, val in enumerate(row) if val]
-        if not rel_cells:
-            return 0
-        min_offset = min(rel_cells)
-        max_offset = max(rel_cells)
-        return max_offset - min_offset + 1
+        return PIECE_TABLE[self.shape][self.rotation_index].width
 
     def rotate(self):
         """Rotate the piece clockwise."""
-        self.rotation_index = (self.rotation_index + 1) % len(self.rotations)
-        self.matrix = [row[:] for row in self.rotations[self.rotation_index]]
+        self.rotation_index = (self.rotation_index + 1) % len(PIECE_TABLE[self.shape])
 
     def rotate_counterclockwise(self):
         """Rotate the piece counterclockwise."""
-        self.rotation_index = (self.rotation_index - 1) % len(self.rotations)
-        self.matrix = [row[:] for row in self.rotations[self.rotation_index]]
+        self.rotation_index = (self.rotation_index - 1) % len(PIECE_TABLE[self.shape])
 
     def get_cells(self):
         """
@@ -174,12 +241,8 @@ class Piece:
         Returns:
             list: List of (x, y) tuples.
         """
-        cells = []
-        for i, row in enumerate(self.matrix):
-            for j, val in enumerate(row):
-                if val:
-                    cells.append((self.x + j, self.y + i))
-        return cells
+        x, y = self.x, self.y
+        return [(x + dx, y + dy) for dx, dy in PIECE_TABLE[self.shape][self.rotation_index].cells]
 
     def move(self, dx, dy):
         """
@@ -199,9 +262,9 @@ class Piece:
         Returns:
             Piece: A cloned piece instance.
         """
-        cloned = Piece(self.shape)
+        cloned = Piece.__new__(Piece)
+        cloned.shape = self.shape
         cloned.rotation_index = self.rotation_index
-        cloned.matrix = [row[:] for row in self.matrix]
         cloned.x = self.x
         cloned.y = self.y
         return cloned
@@ -1,35 +1,179 @@
+import itertools
 import random
-from src.env.piece import Piece, SHAPES
+from src.env.piece import SHAPES
 
 SHAPE_KEYS = list(SHAPES.keys())
 
+_MASK64 = (1 << 64) - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
 
-def random_piece_generator(seed=None):
+# Every ordering of a 7-bag; one generator output picks one of them.
+BAG_PERMUTATIONS = tuple(itertools.permutations(SHAPE_KEYS))
+
+# Pieces generated at once by a PieceStream.
+CHUNK_BAGS = 32
+CHUNK_PIECES = CHUNK_BAGS * len(SHAPE_KEYS)
+
+
+def _splitmix64(state):
     """
-    Generate a random Tetris piece.
+    Advance a SplitMix64 generator.
 
     Args:
-        seed (optional): Seed for the random generator.
+        state (int): Current 64-bit state.
 
     Returns:
-        Piece: A Tetris piece instance.
+        tuple: (next state, 64-bit output).
     """
-    rng = random.Random(seed) if seed is not None else random
-    shape = rng.choice(SHAPE_KEYS)
-    return Piece(shape)
+    state = (state + _GOLDEN_GAMMA) & _MASK64
+    z = state
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return state, z ^ (z >> 31)
 
 
-def generate_7_bag(seed=None):
+class PieceStream:
     """
-    Generate a 7-bag of Tetris piece identifiers.
-
-    Args:
-        seed (optional): Seed for the random generator.
+    Deterministic piece sequence owned by a single environment.
 
-    Returns:
-        list: A list of piece identifiers in random order.
+    Pieces come from a SplitMix64 generator in precomputed chunks of
+    ``CHUNK_PIECES`` shapes: whole 7-bags for the "classic" generator,
+    independent uniform draws for "random". The stream does not touch the
+    global ``random`` module, clones in O(1) by sharing the immutable chunk,
+    and can be split into independent child streams.
     """
-    rng = random.Random(seed) if seed is not None else random
-    tetrominos = SHAPE_KEYS.copy()
-    rng.shuffle(tetrominos)
-    return tetrominos
+
+    __slots__ = ("generator", "chunk_state", "chunk", "cursor")
+
+    def __init__(self, seed=None, generator="classic"):
+        """
+        Initialize the stream.
+
+        Args:
+            seed: Seed of the sequence (int, str, bytes...); None for a random one.
+            generator (str): "random" or "classic" generator.
+        """
+        if generator not in ("random", "classic"):
+            raise ValueError(f"Generator {generator} is not defined.")
+        self.generator = generator
+        self._load_chunk(random.Random(seed).getrandbits(64))
+
+    @classmethod
+    def from_state(cls, generator, chunk_state, cursor):
+        """
+        Restore a stream from ``state()`` output.
+
+        Args:
+            generator (str): "random" or "classic" generator.
+            chunk_state (int): Generator state the current chunk was built from.
+            cursor (int): Pieces already taken from the current chunk.
+
+        Returns:
+            PieceStream: The restored stream.
+        """
+        stream = cls.__new__(cls)
+        stream.generator = generator
+        stream._load_chunk(chunk_state)
+        stream.cursor = cursor
+        return stream
+
+    def state(self):
+        """
+        Get the position of the stream.
+
+        Returns:
+            tuple: (chunk_state, cursor), see ``from_state``.
+        """
+        return self.chunk_state, self.cursor
+
+    def _load_chunk(self, state):
+        """
+        Generate the chunk of pieces following a generator state.
+
+        Args:
+            state (int): 64-bit generator state.
+        """
+        self.chunk_state = state
+        shapes = []
+        if self.generator == "classic":
+            for _ in range(CHUNK_BAGS):
+                state, output = _splitmix64(state)
+                shapes.extend(BAG_PERMUTATIONS[output % len(BAG_PERMUTATIONS)])
+        else:
+            for _ in range(CHUNK_PIECES):
+                state, output = _splitmix64(state)
+                shapes.append(SHAPE_KEYS[output % len(SHAPE_KEYS)])
+        # The next chunk starts from the state after this one.
+        self.chunk = (state, tuple(shapes))
+        self.cursor = 0
+
+    def take(self, n):
+        """
+        Take the next shapes of the sequence.
+
+        Args:
+            n (int): Number of shapes.
+
+        Returns:
+            list[str]: The shapes in order.
+        """
+        end = self.cursor + n
+        if end <= CHUNK_PIECES:
+            shapes = list(self.chunk[1][self.cursor:end])
+            self.cursor = end
+            return shapes
+        shapes = list(self.chunk[1][self.cursor:])
+        self._load_chunk(self.chunk[0])
+        return shapes + self.take(n - len(shapes))
+
+    def next_shape(self):
+        """
+        Take the next shape.
+
+        Returns:
+            str: Shape identifier.
+        """
+        return self.take(1)[0]
+
+    def next_bag(self):
+        """
+        Take the next 7-bag.
+
+        Returns:
+            list[str]: The bag's shapes.
+        """
+        return self.take(len(SHAPE_KEYS))
+
+    def clone(self):
+        """
+        Copy the stream; the copy continues with the same pieces.
+
+        Returns:
+            PieceStream: The copy.
+        """
+        stream = PieceStream.__new__(PieceStream)
+        stream.generator = self.generator
+        stream.chunk_state = self.chunk_state
+        stream.chunk = self.chunk
+        stream.cursor = self.cursor
+        return stream
+
+    def split(self, key):
+        """
+        Derive an independent stream without advancing this one.
+
+        The same stream position and key always give the same child, so
+        parallel workers can each get their own reproducible sequence.
+
+        Args:
+            key (int): Child index.
+
+        Returns:
+            PieceStream: The child stream.
+        """
+        mixed = (((self.cursor << 32) + key) * _GOLDEN_GAMMA) & _MASK64
+        _, output = _splitmix64(self.chunk_state ^ mixed)
+        stream = PieceStream.__new__(PieceStream)
+        stream.generator = self.generator
+        stream._load_chunk(output)
+        return stream
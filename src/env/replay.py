@@ -0,0 +1,221 @@
+import argparse
+import struct
+import time
+
+from src.env.piece import Piece
+from src.env.serialization import encode_env, decode_env, SHAPE_IDS, ID_SHAPES
+
+# Append-only replay file, little-endian:
+#
+#   header  4s magic, u8 version, u8 number of boards
+#   boards  per board: u8 has seed, i64 seed, u16 length, then the board's
+#           starting state as written by encode_env (without colors)
+#   events  6-byte records until the end of the file:
+#           u8 board, u8 kind, u8 shape, u8 rotation, i8 x, i8 y
+#
+# Events are flushed as they happen, so the file of an interrupted game is
+# still readable up to its last placement.
+
+MAGIC = b"TTRP"
+REPLAY_VERSION = 1
+
+EVENT_LOCK = 0
+EVENT_SWAP = 1
+
+_HEADER = struct.Struct("<4sBB")
+_BOARD = struct.Struct("<BqH")
+_EVENT = struct.Struct("<BBBBbb")
+
+
+class ReplayRecorder:
+    """Records the placements of one or more environments to a replay file."""
+
+    def __init__(self, path, envs):
+        """
+        Write the replay header and start recording.
+
+        Args:
+            path (str): File to create.
+            envs (list[TetrisEnv]): Boards to record, in their starting state.
+        """
+        self.envs = list(envs)
+        self.file = open(path, "wb")
+        self.file.write(_HEADER.pack(MAGIC, REPLAY_VERSION, len(self.envs)))
+        for env in self.envs:
+            seed = env.seed if isinstance(env.seed, int) and -2 ** 63 <= env.seed < 2 ** 63 else None
+            state = encode_env(env, colors=False)
+            self.file.write(_BOARD.pack(seed is not None, seed or 0, len(state)))
+            self.file.write(state)
+            env.recorder = self
+        self.file.flush()
+
+    def _write(self, env, kind, piece):
+        """
+        Append one event.
+
+        Args:
+            env (TetrisEnv): Board the event happened on.
+            kind (int): EVENT_LOCK or EVENT_SWAP.
+            piece (Piece): Piece locked, or swapped out to the next slot.
+        """
+        self.file.write(_EVENT.pack(self.envs.index(env), kind, SHAPE_IDS[piece.shape],
+                                    piece.rotation_index, piece.x, piece.y))
+        self.file.flush()
+
+    def record_lock(self, env, piece):
+        """
+        Record a piece locking on a board.
+
+        Args:
+            env (TetrisEnv): The board.
+            piece (Piece): The piece, at its locked position.
+        """
+        self._write(env, EVENT_LOCK, piece)
+
+    def record_swap(self, env):
+        """
+        Record a swap of the current and next pieces.
+
+        The piece swapped out keeps its rotation, which matters once it spawns.
+
+        Args:
+            env (TetrisEnv): The board, after the swap.
+        """
+        self._write(env, EVENT_SWAP, env.next_piece)
+
+    def close(self):
+        """Stop recording and close the file."""
+        for env in self.envs:
+            if env.recorder is self:
+                env.recorder = None
+        self.file.close()
+
+
+def load_replay(path):
+    """
+    Read a replay file.
+
+    Args:
+        path (str): Replay file.
+
+    Returns:
+        tuple: (list of (seed or None, encoded starting state) per board,
+        list of (board, kind, shape, rotation_index, x, y) events).
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, n_boards = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a replay file.")
+    if version != REPLAY_VERSION:
+        raise ValueError(f"Unsupported replay version {version}.")
+    offset = _HEADER.size
+    boards = []
+    for _ in range(n_boards):
+        has_seed, seed, size = _BOARD.unpack_from(data, offset)
+        offset += _BOARD.size
+        boards.append((seed if has_seed else None, data[offset:offset + size]))
+        offset += size
+    # A partly written last record (e.g. after a crash) is ignored.
+    end = offset + (len(data) - offset) // _EVENT.size * _EVENT.size
+    events = [(board, kind, ID_SHAPES[shape], rotation_index, x, y)
+              for board, kind, shape, rotation_index, x, y in _EVENT.iter_unpack(data[offset:end])]
+    return boards, events
+
+
+def _apply_event(env, kind, shape, rotation_index, x, y):
+    """
+    Apply a recorded event to a board.
+
+    Args:
+        env (TetrisEnv): The board.
+        kind (int): EVENT_LOCK or EVENT_SWAP.
+        shape (str): Shape locked, or swapped out to the next slot.
+        rotation_index (int): Rotation of that piece.
+        x (int): Column of the locked piece.
+        y (int): Row of the locked piece.
+    """
+    if env.current_piece.shape != shape:
+        raise ValueError(f"Replay diverged: expected {shape}, got {env.current_piece.shape}.")
+    if kind == EVENT_SWAP:
+        env.current_piece, env.next_piece = env.next_piece, Piece(shape, rotation_index)
+    else:
+        env.current_piece = Piece(shape, rotation_index, x, y)
+        env.lock_piece()
+
+
+def _start_boards(boards):
+    """
+    Decode the starting state of each board.
+
+    Args:
+        boards (list): Boards from ``load_replay``.
+
+    Returns:
+        list[TetrisEnv]: Headless environments.
+    """
+    envs = []
+    for seed, state in boards:
+        env = decode_env(state)
+        env.seed = seed
+        envs.append(env)
+    return envs
+
+
+def iter_replay(path, board=0):
+    """
+    Re-simulate one board of a replay, yielding the state before each event.
+
+    Callers can run a search on the yielded state before the event is applied
+    to check that decisions stay identical.
+
+    Args:
+        path (str): Replay file.
+        board (int): Index of the board to replay.
+
+    Yields:
+        tuple: (TetrisEnv before the event, (kind, shape, rotation_index, x, y)).
+    """
+    boards, events = load_replay(path)
+    env = _start_boards(boards)[board]
+    for event_board, *event in events:
+        if event_board == board:
+            yield env, tuple(event)
+            _apply_event(env, *event)
+
+
+def replay(path):
+    """
+    Re-simulate every board of a replay.
+
+    Args:
+        path (str): Replay file.
+
+    Returns:
+        list[TetrisEnv]: Final state of each board.
+    """
+    boards, events = load_replay(path)
+    envs = _start_boards(boards)
+    for board, *event in events:
+        _apply_event(envs[board], *event)
+    return envs
+
+
+def main():
+    """
+    Re-simulate a replay file headlessly and print each board's final score.
+    """
+    parser = argparse.ArgumentParser(description="Re-simulate a TetrisRL replay.")
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    envs = replay(args.path)
+    elapsed = time.perf_counter() - start
+    for board, env in enumerate(envs):
+        print(f"Board {board}: score {env.score}, game over {env.game_over}")
+    print(f"Replayed in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
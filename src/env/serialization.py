@@ -0,0 +1,182 @@
+import struct
+
+import numpy as np
+
+from src.env.env import TetrisEnv
+from src.env.grid import Grid
+from src.env.bitboard import BitboardGrid, UNKNOWN_COLOR
+from src.env.piece import Piece, SHAPES, SHAPES_COLORS
+from src.env.random_piece_generator import PieceStream
+
+# Compact binary encoding of a TetrisEnv. Layout (little-endian), version 2:
+#
+#   header  4s magic, u8 version, u8 rows, u8 cols, u8 generator, u8 flags,
+#           u32 score, u8 level, u8 lines cleared,
+#           u8 shape, u8 rotation, i8 x, i8 y, u8 next shape
+#   board   rows x u16 row bitmasks (bit x set for an occupied column x)
+#   colors  rows x cols u8 palette indices, only when FLAG_COLORS is set
+#   bag     u8 length, then one u8 shape id per piece
+#   rng     u16 length, then the piece stream position: u64 chunk state and
+#           u16 cursor
+#
+# The board sits at a fixed offset, so board_views() can expose it as NumPy
+# arrays over the buffer without copying.
+
+MAGIC = b"TTRS"
+FORMAT_VERSION = 2
+
+FLAG_GAME_OVER = 1
+FLAG_COLORS = 2
+
+GENERATORS = ("classic", "random")
+SHAPE_IDS = {shape: i for i, shape in enumerate(SHAPES)}
+ID_SHAPES = list(SHAPES)
+
+# Color layer palette: 0 is empty, then one entry per shape, then cells of
+# unknown origin.
+PALETTE = [0] + [SHAPES_COLORS[shape] for shape in ID_SHAPES] + [UNKNOWN_COLOR]
+COLOR_IDS = {color: i for i, color in enumerate(PALETTE)}
+
+_HEADER = struct.Struct("<4sBBBBBIBBBBbbB")
+_STREAM = struct.Struct("<QH")
+
+
+def encode_env(env, colors=True):
+    """
+    Encode an environment into bytes.
+
+    Args:
+        env (TetrisEnv): Environment to encode.
+        colors (bool): Whether to store the color layer when the grid has one.
+
+    Returns:
+        bytes: The encoded state.
+    """
+    grid = env.grid
+    if grid.cols > 16:
+        raise ValueError(f"Cannot encode a grid with {grid.cols} columns (at most 16).")
+    board = None
+    if colors and not (isinstance(grid, BitboardGrid) and grid.colors is None):
+        board = grid.colors if isinstance(grid, BitboardGrid) else grid.board
+    flags = (FLAG_GAME_OVER if env.game_over else 0) | (FLAG_COLORS if board is not None else 0)
+    piece = env.current_piece
+    parts = [
+        _HEADER.pack(MAGIC, FORMAT_VERSION, grid.rows, grid.cols, GENERATORS.index(env.generator), flags,
+                     env.score, getattr(env, "level", 0), grid.lines_cleared,
+                     SHAPE_IDS[piece.shape], piece.rotation_index, piece.x, piece.y,
+                     SHAPE_IDS[env.next_piece.shape]),
+        struct.pack(f"<{grid.rows}H", *grid.board_key()),
+    ]
+    if board is not None:
+        unknown = COLOR_IDS[UNKNOWN_COLOR]
+        parts.append(bytes(COLOR_IDS.get(cell, unknown) if cell else 0 for row in board for cell in row))
+    bag = env.current_bag if env.generator == "classic" else []
+    parts.append(bytes([len(bag)] + [SHAPE_IDS[shape] for shape in bag]))
+    parts.append(struct.pack("<H", _STREAM.size))
+    parts.append(_STREAM.pack(*env.piece_stream.state()))
+    return b"".join(parts)
+
+
+def _read_header(data):
+    """
+    Unpack and check the fixed-size header.
+
+    Args:
+        data (bytes-like): Encoded state.
+
+    Returns:
+        tuple: The header fields.
+    """
+    header = _HEADER.unpack_from(data)
+    if header[0] != MAGIC:
+        raise ValueError("Not an encoded Tetris state.")
+    if header[1] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported state format version {header[1]}.")
+    return header
+
+
+def board_views(data):
+    """
+    View the board of an encoded state without copying it.
+
+    Args:
+        data (bytes-like): Encoded state, e.g. bytes or a memoryview of a
+            larger buffer.
+
+    Returns:
+        tuple: (uint16 array of row bitmasks, uint8 array of shape (rows, cols)
+        with palette indices or None when the state has no color layer).
+    """
+    header = _read_header(data)
+    rows, cols, flags = header[2], header[3], header[5]
+    bits = np.frombuffer(data, dtype="<u2", count=rows, offset=_HEADER.size)
+    colors = None
+    if flags & FLAG_COLORS:
+        colors = np.frombuffer(data, dtype=np.uint8, count=rows * cols,
+                               offset=_HEADER.size + 2 * rows).reshape(rows, cols)
+    return bits, colors
+
+
+def decode_env(data, grid_type="bitboard", track_colors=None, track_features=False, env_class=TetrisEnv):
+    """
+    Rebuild an environment from ``encode_env`` output.
+
+    Args:
+        data (bytes-like): Encoded state.
+        grid_type (str): "standard" or "bitboard" grid.
+        track_colors (bool): Whether a bitboard grid keeps a color layer;
+            defaults to whether the encoding has one.
+        track_features (bool): Whether the grid tracks features incrementally.
+        env_class (type): TetrisEnv or a subclass to build.
+
+    Returns:
+        TetrisEnv: The decoded environment. Timing is reset.
+    """
+    data = memoryview(data)
+    (_, _, rows, cols, generator, flags, score, level, lines_cleared,
+     shape, rotation_index, x, y, next_shape) = _read_header(data)
+    offset = _HEADER.size
+    bits = struct.unpack_from(f"<{rows}H", data, offset)
+    offset += 2 * rows
+    colors = None
+    if flags & FLAG_COLORS:
+        cells = data[offset:offset + rows * cols]
+        colors = [[PALETTE[cell] for cell in cells[row * cols:(row + 1) * cols]] for row in range(rows)]
+        offset += rows * cols
+    bag = [ID_SHAPES[shape_id] for shape_id in data[offset + 1:offset + 1 + data[offset]]]
+    offset += 1 + data[offset]
+    if struct.unpack_from("<H", data, offset)[0] != _STREAM.size:
+        raise ValueError("Malformed piece stream block.")
+    piece_stream = PieceStream.from_state(GENERATORS[generator], *_STREAM.unpack_from(data, offset + 2))
+
+    if track_colors is None:
+        track_colors = colors is not None
+    if grid_type == "standard":
+        grid = Grid(rows, cols, track_features=track_features)
+        board = colors or [[UNKNOWN_COLOR if (row >> col) & 1 else 0 for col in range(cols)] for row in bits]
+        grid.board = [row[:] for row in board]
+        grid._rebuild_features()
+    elif grid_type == "bitboard":
+        grid = BitboardGrid(rows, cols, track_colors=track_colors, track_features=track_features)
+        grid.load_bits(bits, colors)
+    else:
+        raise ValueError(f"Grid type {grid_type} is not defined.")
+    grid.lines_cleared = lines_cleared
+
+    env = env_class.__new__(env_class)
+    env.rows = rows
+    env.cols = cols
+    env.generator = GENERATORS[generator]
+    env.seed = None
+    env.piece_stream = piece_stream
+    env.level = level
+    env.grid = grid
+    env.current_piece = Piece(ID_SHAPES[shape], rotation_index, x, y)
+    env.next_piece = Piece(ID_SHAPES[next_shape])
+    if env.generator == "classic":
+        env.current_bag = bag
+    env.score = score
+    env.moves_played = 0
+    env.timing = 0
+    env.game_over = bool(flags & FLAG_GAME_OVER)
+    return env
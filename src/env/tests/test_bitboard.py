@@ -0,0 +1,66 @@
+import random
+
+from src.env.env import TetrisEnv
+from src.env.grid import Grid
+from src.env.bitboard import BitboardGrid
+from src.env.piece import Piece, SHAPES
+
+
+def random_piece(rng, cols):
+    """
+    Create a piece with a random shape, rotation and column, which may stick
+    out of the board.
+
+    Args:
+        rng (random.Random): Random generator.
+        cols (int): Number of grid columns.
+
+    Returns:
+        Piece: Piece at the spawn row.
+    """
+    piece = Piece(rng.choice(list(SHAPES)))
+    for _ in range(rng.randrange(4)):
+        piece.rotate()
+    piece.x = rng.randrange(-2, cols)
+    return piece
+
+
+def test_bitboard_matches_grid():
+    for track_colors in (True, False):
+        grid = Grid(20, 10)
+        bitboard = BitboardGrid(20, 10, track_colors=track_colors)
+        rng = random.Random(0)
+        for _ in range(500):
+            piece = random_piece(rng, 10)
+            assert bitboard.is_valid_position(piece) == grid.is_valid_position(piece)
+            if not grid.is_valid_position(piece):
+                continue
+            while grid.is_valid_position(piece):
+                piece.y += 1
+            piece.y -= 1
+            grid.place_piece(piece.clone())
+            bitboard.place_piece(piece.clone())
+            assert bitboard.lines_cleared == grid.lines_cleared
+            if track_colors:
+                assert bitboard.board == grid.board
+            else:
+                assert bitboard.board == [[int(bool(cell)) for cell in row] for row in grid.board]
+            if any(grid.board[0]):
+                grid.reset()
+                bitboard.reset()
+
+
+def test_clone_is_independent():
+    grid = BitboardGrid(20, 10)
+    piece = Piece("O")
+    piece.y = 18
+    clone = grid.clone()
+    grid.place_piece(piece)
+    assert any(grid.board[19])
+    assert not any(clone.board[19])
+    assert clone.is_valid_position(piece)
+
+
+def test_env_selects_the_grid_type():
+    assert type(TetrisEnv(20, 10, grid_type="bitboard").grid) is BitboardGrid
+    assert type(TetrisEnv(20, 10, grid_type="standard").grid) is Grid
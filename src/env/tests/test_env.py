@@ -0,0 +1,83 @@
+import random
+
+from src.env.env import TetrisEnv
+from src.env.piece import SHAPES
+
+
+def landing_cells(env, piece):
+    """
+    Get the cells a piece occupies once hard-dropped.
+
+    Args:
+        env (TetrisEnv): Environment whose grid the piece drops on.
+        piece (Piece): Piece at its starting position.
+
+    Returns:
+        frozenset: Occupied (x, y) cells after the drop.
+    """
+    piece = piece.clone()
+    piece.y = env.grid.get_drop_y(piece)
+    return frozenset(piece.get_cells())
+
+
+def test_possible_moves_cover_each_landing_once():
+    rng = random.Random(0)
+    for grid_type in ("standard", "bitboard"):
+        env = TetrisEnv(20, 10, "classic", 0, grid_type=grid_type)
+        for _ in range(150):
+            if env.game_over:
+                env.reset()
+            for shape in SHAPES:
+                state = env.clone()
+                state.current_piece.shape = shape
+                state.current_piece.rotation_index = 0
+                # Every rotation count and column, repeated orientations included.
+                expected = set()
+                for rotations in range(4):
+                    for x in range(-3, state.grid.cols):
+                        piece = state.current_piece.clone()
+                        for _ in range(rotations):
+                            piece.rotate()
+                        piece.x = x
+                        if state.grid.is_valid_position(piece):
+                            expected.add(landing_cells(state, piece))
+                moves = state.get_possible_moves()
+                landed = []
+                for move in moves:
+                    piece = state.current_piece.clone()
+                    for _ in range(move.rotations):
+                        piece.rotate()
+                    piece.x = move.x
+                    landed.append(landing_cells(state, piece))
+                assert len(set(landed)) == len(moves)
+                assert set(landed) == expected
+            env.apply_move(rng.choice(env.get_possible_moves()))
+
+
+def test_ghost_follows_the_board_and_the_piece():
+    for grid_type in ("standard", "bitboard"):
+        env = TetrisEnv(20, 10, "classic", 1, grid_type=grid_type)
+        ghost = env.get_ghost_piece()
+        assert env.get_ghost_piece() is ghost
+        assert ghost.y == env.grid.get_drop_y(env.current_piece)
+
+        # A block placed under the piece without moving it raises the ghost.
+        blocker = env.current_piece.clone()
+        blocker.y = ghost.y
+        env.grid.place_piece(blocker)
+        raised = env.get_ghost_piece()
+        assert raised.y < ghost.y
+        assert raised.y == env.grid.get_drop_y(env.current_piece)
+
+        env.move_piece(1, 0)
+        assert env.get_ghost_piece().x == env.current_piece.x
+
+        clone = env.clone()
+        assert clone.get_ghost_piece() is not env.get_ghost_piece()
+
+        # Resetting empties the board in place; the ghost drops to the floor again.
+        env.reset()
+        piece = env.current_piece.clone()
+        piece.y = env.grid.get_drop_y(piece)
+        assert env.get_ghost_piece().get_cells() == piece.get_cells()
+        assert max(y for _, y in piece.get_cells()) == env.rows - 1
@@ -0,0 +1,105 @@
+import random
+
+from src.env.grid import Grid
+from src.env.bitboard import BitboardGrid
+from src.env.piece import Piece, SHAPES
+
+
+def random_placements(seed, count=300, rows=20, cols=10):
+    """
+    Yield random valid placements, dropped from the top, on a fresh board.
+
+    Args:
+        seed (int): Seed for the placements.
+        count (int): Number of placements.
+        rows (int): Number of grid rows.
+        cols (int): Number of grid columns.
+
+    Yields:
+        Piece: Piece at its spawn row and target rotation and column.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        shape = rng.choice(list(SHAPES))
+        rotation_index = rng.randrange(len(Piece(shape).rotations))
+        info = Piece(shape, rotation_index).info
+        yield Piece(shape, rotation_index, rng.randrange(-info.min_col, cols - info.max_col), 0)
+
+
+def test_bitboard_drops_and_heights_match_grid():
+    grid = Grid(20, 10)
+    bitboard = BitboardGrid(20, 10)
+    for piece in random_placements(0):
+        assert grid.is_valid_position(piece) == bitboard.is_valid_position(piece)
+        if not grid.is_valid_position(piece):
+            grid.reset()
+            bitboard.reset()
+            continue
+        piece.y = grid.get_drop_y(piece)
+        assert bitboard.get_drop_y(piece) == piece.y
+        grid.place_piece(piece.clone())
+        bitboard.place_piece(piece.clone())
+        assert bitboard.board == grid.board
+        assert bitboard.lines_cleared == grid.lines_cleared
+        assert bitboard.get_column_heights() == grid.get_column_heights()
+
+
+def test_drop_y_matches_stepping_down():
+    for grid in (Grid(20, 10), BitboardGrid(20, 10)):
+        rng = random.Random(1)
+        for piece in random_placements(1):
+            if not grid.is_valid_position(piece):
+                grid.reset()
+                continue
+            # Also probe from lower rows, e.g. under overhangs.
+            for y in range(grid.rows):
+                probe = Piece(piece.shape, piece.rotation_index, piece.x, y)
+                if grid.is_valid_position(probe):
+                    assert grid.get_drop_y(probe) == grid._step_drop_y(probe)
+            piece.y = grid.get_drop_y(piece)
+            if rng.random() < 0.3:
+                # Leave holes and overhangs behind by locking pieces early.
+                piece.y = rng.randrange(piece.y + 1)
+            grid.place_piece(piece)
+
+
+def rescanned_features(grid):
+    """
+    Recompute the tracked features of a grid from its cells.
+
+    Args:
+        grid: Grid or BitboardGrid instance.
+
+    Returns:
+        tuple: (column heights, holes per column, filled cells per row).
+    """
+    board = grid.board
+    heights = [0] * grid.cols
+    holes = [0] * grid.cols
+    for x in range(grid.cols):
+        filled = [y for y in range(grid.rows) if board[y][x]]
+        if filled:
+            heights[x] = grid.rows - filled[0]
+            holes[x] = sum(1 for y in range(filled[0], grid.rows) if not board[y][x])
+    row_fill = [sum(1 for cell in row if cell) for row in board]
+    return heights, holes, row_fill
+
+
+def test_tracked_features_match_rescan():
+    for grid_type in (Grid, BitboardGrid):
+        grid = grid_type(20, 10, track_features=True)
+        rng = random.Random(2)
+        for piece in random_placements(2, count=500):
+            if not grid.is_valid_position(piece):
+                grid.reset()
+                continue
+            piece.y = grid.get_drop_y(piece)
+            if rng.random() < 0.3:
+                piece.y = rng.randrange(piece.y + 1)
+            grid.place_piece(piece)
+            clone = grid.clone()
+            for tracked in (grid, clone):
+                heights, holes, row_fill = rescanned_features(tracked)
+                assert tracked.get_column_heights() == heights
+                assert tracked.column_holes == holes
+                assert tracked.row_fill == row_fill
@@ -0,0 +1,62 @@
+import random
+
+from src.env.env import TetrisEnv
+from src.env.piece import Piece, SHAPES
+
+
+def play_actions(env, actions):
+    """
+    Play an action sequence on the current piece, stopping before the drop.
+
+    Args:
+        env (TetrisEnv): Environment to play on.
+        actions (tuple): Actions ending with a hard drop.
+
+    Returns:
+        bool: True if every action before the drop took effect.
+    """
+    for kind, value in actions[:-1]:
+        if kind == "rotate":
+            moved = env.rotate_piece(clockwise=value)
+        elif kind == "move":
+            moved = env.move_piece(value, 0)
+        else:
+            moved = env.move_piece(0, 1)
+        if not moved:
+            return False
+    return True
+
+
+def test_paths_lead_to_their_placements():
+    rng = random.Random(0)
+    env = TetrisEnv(20, 10, seed=0, grid_type="bitboard")
+    for _ in range(120):
+        if env.game_over:
+            env.reset()
+        placements = env.get_reachable_placements()
+        rests = [(p.rotation_index, p.x, p.y) for p in placements]
+        assert len(set(rests)) == len(rests)
+        lengths = [len(p.actions) for p in placements]
+        assert lengths == sorted(lengths)
+        for placement in placements:
+            probe = env.clone()
+            assert play_actions(probe, placement.actions)
+            assert placement.actions[-1] == ("drop", None)
+            piece = probe.current_piece
+            assert (piece.rotation_index, piece.x, probe.grid.get_drop_y(piece)) == (
+                placement.rotation_index, placement.x, placement.y)
+        # Leave uneven stacks with overhangs to tuck under.
+        env.apply_move(rng.choice(placements))
+
+
+def test_reaches_every_simple_move_on_an_empty_board():
+    for shape in SHAPES:
+        env = TetrisEnv(20, 10, seed=0, grid_type="bitboard")
+        env.current_piece = Piece(shape)
+        rests = {tuple(sorted(Piece(shape, p.rotation_index, p.x, p.y).get_cells()))
+                 for p in env.get_reachable_placements()}
+        for move in env.get_possible_moves():
+            target = env.simulate_move(move)
+            placed = target.grid.board_key()
+            cells = {(x, y) for y, row in enumerate(placed) for x in range(10) if row >> x & 1}
+            assert tuple(sorted(cells)) in rests
@@ -0,0 +1,41 @@
+from src.env.piece import Piece, PIECE_TABLE, SHAPES, SHAPES_COLORS
+
+
+def test_table_matches_the_shape_matrices():
+    for shape, rotations in SHAPES.items():
+        assert len(PIECE_TABLE[shape]) == len(rotations)
+        for info, matrix in zip(PIECE_TABLE[shape], rotations):
+            cells = [(j, i) for i, row in enumerate(matrix) for j, val in enumerate(row) if val]
+            assert list(info.cells) == cells
+            assert [list(row) for row in info.matrix] == matrix
+            for i, mask in enumerate(info.row_masks):
+                assert mask == sum(1 << j for j, val in enumerate(matrix[i]) if val)
+            columns = [j for j, _ in cells]
+            assert (info.min_col, info.max_col) == (min(columns), max(columns))
+            assert info.width == max(columns) - min(columns) + 1
+            assert info.height == max(i for _, i in cells) - min(i for _, i in cells) + 1
+            for col, bottom in zip(range(info.min_col, info.max_col + 1), info.bottom):
+                assert bottom == max(i for j, i in cells if j == col)
+
+
+def test_piece_reads_the_table():
+    for shape in SHAPES:
+        piece = Piece(shape, x=4, y=2)
+        assert piece.color == SHAPES_COLORS[shape]
+        for index in range(2 * len(SHAPES[shape])):
+            info = PIECE_TABLE[shape][piece.rotation_index]
+            assert piece.rotation_index == index % len(SHAPES[shape])
+            assert piece.get_cells() == [(4 + dx, 2 + dy) for dx, dy in info.cells]
+            assert piece.piece_width == info.width
+            piece.rotate()
+        piece.rotate_counterclockwise()
+        assert piece.rotation_index == len(SHAPES[shape]) - 1
+
+
+def test_clone_is_independent():
+    piece = Piece("T", 1, 5, 6)
+    clone = piece.clone()
+    clone.rotate()
+    clone.move(1, 1)
+    assert (piece.rotation_index, piece.x, piece.y) == (1, 5, 6)
+    assert (clone.rotation_index, clone.x, clone.y) == (2, 6, 7)
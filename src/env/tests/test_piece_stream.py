@@ -0,0 +1,67 @@
+import random
+
+from src.env.env import TetrisEnv
+from src.env.random_piece_generator import PieceStream, SHAPE_KEYS, CHUNK_PIECES
+
+
+def test_seed_fixes_the_sequence_regardless_of_global_state():
+    random.seed(1)
+    first = PieceStream(42).take(3 * CHUNK_PIECES)
+    random.seed(2)
+    random.random()
+    assert PieceStream(42).take(3 * CHUNK_PIECES) == first
+    # Drawing pieces leaves the global generator alone.
+    random.seed(3)
+    expected = random.random()
+    random.seed(3)
+    PieceStream(42).take(CHUNK_PIECES + 5)
+    assert random.random() == expected
+    assert PieceStream(43).take(3 * CHUNK_PIECES) != first
+
+
+def test_classic_windows_are_bags():
+    stream = PieceStream(7)
+    for _ in range(100):
+        assert sorted(stream.next_bag()) == sorted(SHAPE_KEYS)
+    # Bags stay aligned when pieces are taken one at a time across chunks.
+    stream = PieceStream(8)
+    shapes = [stream.next_shape() for _ in range(3 * CHUNK_PIECES)]
+    for i in range(0, len(shapes), len(SHAPE_KEYS)):
+        assert sorted(shapes[i:i + len(SHAPE_KEYS)]) == sorted(SHAPE_KEYS)
+
+
+def test_clone_and_restored_state_stay_in_sync():
+    for generator in ("classic", "random"):
+        stream = PieceStream(5, generator)
+        stream.take(CHUNK_PIECES - 3)
+        clone = stream.clone()
+        restored = PieceStream.from_state(generator, *stream.state())
+        expected = stream.take(2 * CHUNK_PIECES)
+        assert clone.take(2 * CHUNK_PIECES) == expected
+        assert restored.take(2 * CHUNK_PIECES) == expected
+
+
+def test_split_is_stable_and_independent():
+    stream = PieceStream(9)
+    stream.take(10)
+    position = stream.state()
+    children = [stream.split(key).take(CHUNK_PIECES) for key in range(4)]
+    assert stream.state() == position
+    assert [stream.split(key).take(CHUNK_PIECES) for key in range(4)] == children
+    assert len({tuple(child) for child in children}) == len(children)
+    assert stream.take(CHUNK_PIECES) not in children
+    # Children depend on where the parent is in its sequence.
+    assert stream.split(0).take(CHUNK_PIECES) != children[0]
+
+
+def test_seed_fixes_the_whole_game():
+    games = []
+    for _ in range(2):
+        env = TetrisEnv(20, 10, "classic", seed=11)
+        shapes = []
+        while not env.game_over and len(shapes) < 60:
+            shapes.append(env.current_piece.shape)
+            env.apply_move(env.get_possible_moves()[0])
+        games.append(shapes)
+        random.random()
+    assert games[0] == games[1]
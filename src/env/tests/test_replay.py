@@ -0,0 +1,77 @@
+import random
+
+from src.env.env import TetrisEnv
+from src.env.replay import ReplayRecorder, iter_replay, replay
+
+
+def record_game(path, seed, pieces=150):
+    """
+    Record two random games, with swaps and soft-dropped locks, to a file.
+
+    Args:
+        path (str): Replay file to create.
+        seed (int): Seed for the pieces and moves.
+        pieces (int): Placements per board.
+
+    Returns:
+        list[TetrisEnv]: The recorded boards in their final state.
+    """
+    rng = random.Random(seed)
+    envs = [TetrisEnv(20, 10, "classic", seed, grid_type="bitboard"),
+            TetrisEnv(20, 10, "random", seed + 1, grid_type="standard")]
+    recorder = ReplayRecorder(path, envs)
+    for _ in range(pieces):
+        for env in envs:
+            if env.game_over:
+                continue
+            if rng.random() < 0.2:
+                env.swap_piece()
+            if rng.random() < 0.2:
+                # Gravity-style locks go through drop_piece instead of apply_move.
+                while not env.game_over and env.move_piece(0, 1):
+                    pass
+                env.drop_piece()
+            else:
+                env.apply_move(rng.choice(env.get_possible_moves()))
+    recorder.close()
+    return envs
+
+
+def test_replay_reproduces_every_board(tmp_path):
+    path = str(tmp_path / "game.replay")
+    envs = record_game(path, 3)
+    replayed = replay(path)
+    assert len(replayed) == len(envs)
+    for env, copy in zip(envs, replayed):
+        assert copy.grid.board_key() == env.grid.board_key()
+        assert copy.score == env.score
+        assert copy.game_over == env.game_over
+        assert copy.current_piece.shape == env.current_piece.shape
+        assert copy.next_piece.shape == env.next_piece.shape
+    assert all(env.recorder is None for env in envs)
+
+
+def test_iter_replay_yields_states_before_events(tmp_path):
+    path = str(tmp_path / "game.replay")
+    envs = record_game(path, 4, pieces=40)
+    env = None
+    for env, (kind, shape, rotation_index, x, y) in iter_replay(path, board=1):
+        assert env.current_piece.shape == shape
+    # The generator applies each event after yielding, so the last yielded
+    # environment ends in the final state.
+    assert env.grid.board_key() == envs[1].grid.board_key()
+    assert env.score == envs[1].score
+
+
+def test_truncated_file_replays_up_to_last_event(tmp_path):
+    path = str(tmp_path / "game.replay")
+    record_game(path, 5, pieces=40)
+    with open(path, "rb") as f:
+        data = f.read()
+    # Drop one whole event and half of the one before it.
+    with open(path, "wb") as f:
+        f.write(data[:-9])
+    shorter = replay(path)
+    with open(path, "wb") as f:
+        f.write(data[:-12])
+    assert [env.grid.board_key() for env in shorter] == [env.grid.board_key() for env in replay(path)]
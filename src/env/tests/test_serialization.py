@@ -0,0 +1,109 @@
+import random
+
+import pytest
+
+from src.env.env import TetrisEnv
+from src.env.serialization import encode_env, decode_env, board_views
+
+
+def played_states(seed, grid_type, generator, games=3):
+    """
+    Yield the states of random games after every placement.
+
+    Args:
+        seed (int): Seed for the pieces and moves.
+        grid_type (str): "standard" or "bitboard".
+        generator (str): "classic" or "random".
+        games (int): Number of games.
+
+    Yields:
+        TetrisEnv: The live environment.
+    """
+    rng = random.Random(seed)
+    for game in range(games):
+        env = TetrisEnv(20, 10, generator, seed * 100 + game, grid_type=grid_type, track_features=True)
+        while not env.game_over:
+            env.apply_move(rng.choice(env.get_possible_moves()))
+            yield env
+
+
+def piece_state(piece):
+    """
+    Get the position of a piece.
+
+    Args:
+        piece (Piece): Tetris piece.
+
+    Returns:
+        tuple: Shape, rotation index, x and y.
+    """
+    return piece.shape, piece.rotation_index, piece.x, piece.y
+
+
+@pytest.mark.parametrize("grid_type", ["standard", "bitboard"])
+@pytest.mark.parametrize("generator", ["classic", "random"])
+def test_round_trip_is_exact(grid_type, generator):
+    for env in played_states(0, grid_type, generator):
+        data = encode_env(env)
+        for decoded_type in ("standard", "bitboard"):
+            decoded = decode_env(data, grid_type=decoded_type, track_features=True)
+            assert decoded.grid.board_key() == env.grid.board_key()
+            assert [list(row) for row in decoded.grid.board] == [list(row) for row in env.grid.board]
+            assert decoded.grid.get_column_heights() == env.grid.get_column_heights()
+            assert decoded.grid.column_holes == env.grid.column_holes
+            assert decoded.grid.row_fill == env.grid.row_fill
+            assert decoded.grid.lines_cleared == env.grid.lines_cleared
+            assert piece_state(decoded.current_piece) == piece_state(env.current_piece)
+            assert decoded.next_piece.shape == env.next_piece.shape
+            assert (decoded.score, decoded.level, decoded.game_over) == (env.score, env.level, env.game_over)
+            if generator == "classic":
+                assert decoded.current_bag == env.current_bag
+            assert encode_env(decoded) == data
+
+
+def test_decoded_game_continues_identically():
+    for step, env in enumerate(played_states(1, "bitboard", "classic", games=1)):
+        if step % 5 or env.game_over:
+            continue
+        decoded = decode_env(encode_env(env))
+        original = env.clone()
+        for _ in range(30):
+            if original.game_over:
+                break
+            move = original.get_possible_moves()[0]
+            original.apply_move(move)
+            decoded.apply_move(move)
+            assert decoded.grid.board_key() == original.grid.board_key()
+            assert piece_state(decoded.next_piece) == piece_state(original.next_piece)
+
+
+def test_env_wrappers_build_the_calling_class():
+    class RecordedEnv(TetrisEnv):
+        pass
+
+    env = next(played_states(3, "bitboard", "classic"))
+    decoded = RecordedEnv.from_encoding(env.encode(colors=False))
+    assert type(decoded) is RecordedEnv
+    assert decoded.grid.board_key() == env.grid.board_key()
+    assert decoded.encode(colors=False) == env.encode(colors=False)
+
+
+def test_board_views_share_the_buffer():
+    env = next(played_states(2, "bitboard", "classic"))
+    data = bytearray(encode_env(env))
+    bits, colors = board_views(data)
+    assert tuple(bits.tolist()) == env.grid.board_key()
+    assert colors.shape == (env.grid.rows, env.grid.cols)
+    assert ((colors != 0) == [[bool(cell) for cell in row] for row in env.grid.board]).all()
+    bits_only, no_colors = board_views(encode_env(env, colors=False))
+    assert no_colors is None
+    assert tuple(bits_only.tolist()) == env.grid.board_key()
+
+
+def test_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        decode_env(b"NOPE" + bytes(40))
+    data = bytearray(encode_env(TetrisEnv(20, 10, "classic", 0)))
+    data[4] = 1
+    with pytest.raises(ValueError):
+        decode_env(bytes(data))
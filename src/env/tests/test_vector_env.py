@@ -0,0 +1,79 @@
+import numpy as np
+
+from src.env.bitboard import BitboardGrid
+from src.env.piece import Piece
+from src.env.vector_env import VectorTetrisEnv, SHAPE_KEYS
+
+
+def reference_step(bits, rows, cols, shape, action):
+    """
+    Place one piece with BitboardGrid the way VectorTetrisEnv.step should.
+
+    Args:
+        bits (np.ndarray): Row bitmasks of the board.
+        rows (int): Number of grid rows.
+        cols (int): Number of grid columns.
+        shape (str): Shape of the current piece.
+        action (tuple): Rotation count and target x.
+
+    Returns:
+        tuple: (row bitmasks after the placement, lines cleared), or None if
+        the action is invalid.
+    """
+    grid = BitboardGrid(rows, cols, track_colors=False)
+    grid.bits = [int(row) for row in bits]
+    piece = Piece(shape)
+    piece.rotation_index = action[0] % len(piece.rotations)
+    piece.x = action[1]
+    if not grid.is_valid_position(piece):
+        return None
+    piece.y = grid.get_drop_y(piece)
+    grid.place_piece(piece)
+    return tuple(grid.bits), grid.lines_cleared
+
+
+def test_step_matches_bitboard_grid():
+    vec = VectorTetrisEnv(8, rows=20, cols=10, seed=0)
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        before = vec.boards.copy()
+        shapes = [SHAPE_KEYS[s] for s in vec.current_pieces]
+        actions = []
+        for i in range(vec.n_envs):
+            possible = vec.get_possible_actions(i)
+            actions.append(possible[rng.integers(len(possible))])
+        boards, lines, dones, _ = vec.step(np.array(actions))
+        for i in range(vec.n_envs):
+            expected = reference_step(before[i], 20, 10, shapes[i], actions[i])
+            assert expected is not None
+            assert lines[i] == expected[1]
+            if not dones[i]:
+                assert tuple(int(row) for row in boards[i]) == expected[0]
+
+
+def test_invalid_action_ends_only_that_game():
+    vec = VectorTetrisEnv(3, rows=20, cols=10, seed=0)
+    vec.step(np.array([vec.get_possible_actions(i)[0] for i in range(vec.n_envs)]))
+    vec.scores[:] = [4, 5, 6]
+    actions = np.array([vec.get_possible_actions(i)[0] for i in range(vec.n_envs)])
+    actions[1] = (0, 50)
+    _, lines, dones, final_scores = vec.step(actions)
+    assert dones.tolist() == [False, True, False]
+    assert final_scores.tolist() == [0, 5, 0]
+    assert lines[1] == 0
+    # The ended game was reset; the others kept their stacks and scores.
+    assert not vec.boards[1].any()
+    assert vec.boards[0].any() and vec.boards[2].any()
+    assert vec.scores.tolist() == [4 + lines[0], 0, 6 + lines[2]]
+
+
+def test_colliding_action_ends_the_game():
+    vec = VectorTetrisEnv(1, rows=20, cols=10, seed=0)
+    vec.scores[0] = 3
+    # A checkerboard leaves no room for any piece at the spawn rows.
+    vec.boards[0, :4] = [0b0101010101, 0b1010101010, 0b0101010101, 0b1010101010]
+    assert vec.get_possible_actions(0) == []
+    _, _, dones, final_scores = vec.step(np.array([(0, 3)]))
+    assert dones[0]
+    assert final_scores[0] == 3
+    assert not vec.boards[0].any()
@@ -0,0 +1,238 @@
+import numpy as np
+
+from src.env.piece import PIECE_TABLE, SHAPES
+
+SHAPE_KEYS = list(SHAPES.keys())
+MAX_ROTATIONS = 4
+PIECE_ROWS = 4
+
+
+def _build_mask_table():
+    """
+    Pack the piece row masks into arrays indexed by shape id and rotation.
+
+    Rotations beyond a shape's distinct ones wrap around, so a rotation
+    count can be used directly as an index.
+
+    Returns:
+        tuple: (row_masks, min_col, max_col, n_rotations, spawn_width) arrays.
+    """
+    n_shapes = len(SHAPE_KEYS)
+    row_masks = np.zeros((n_shapes, MAX_ROTATIONS, PIECE_ROWS), dtype=np.int64)
+    min_col = np.zeros((n_shapes, MAX_ROTATIONS), dtype=np.int64)
+    max_col = np.zeros((n_shapes, MAX_ROTATIONS), dtype=np.int64)
+    n_rotations = np.zeros(n_shapes, dtype=np.int64)
+    width = np.zeros(n_shapes, dtype=np.int64)
+    for s, shape in enumerate(SHAPE_KEYS):
+        rotations = PIECE_TABLE[shape]
+        n_rotations[s] = len(rotations)
+        width[s] = rotations[0].width
+        for r in range(MAX_ROTATIONS):
+            info = rotations[r % len(rotations)]
+            row_masks[s, r, :len(info.row_masks)] = info.row_masks
+            min_col[s, r] = info.min_col
+            max_col[s, r] = info.max_col
+    return row_masks, min_col, max_col, n_rotations, width
+
+
+ROW_MASKS, MIN_COL, MAX_COL, N_ROTATIONS, SPAWN_WIDTH = _build_mask_table()
+
+
+class VectorTetrisEnv:
+    """
+    N independent headless Tetris games stepped in lockstep.
+
+    Boards are stored as one ``(n_envs, rows)`` array of row bitmasks and the
+    upcoming pieces of every game as one ``(n_envs, 14)`` array of shape ids
+    (the current and next 7-bag). Actions are placements: a rotation count
+    from spawn and the target x, as in ``TetrisEnv.get_possible_moves``.
+    Finished games are reset automatically.
+    """
+
+    def __init__(self, n_envs, rows=20, cols=10, seed=None):
+        """
+        Initialize the vectorized environment.
+
+        Args:
+            n_envs (int): Number of games.
+            rows (int): Number of grid rows.
+            cols (int): Number of grid columns.
+            seed: Seed for the piece sequences of all games.
+        """
+        self.n_envs = n_envs
+        self.rows = rows
+        self.cols = cols
+        self.full_mask = (1 << cols) - 1
+        self.rng = np.random.default_rng(seed)
+        self.boards = np.zeros((n_envs, rows), dtype=np.int64)
+        self.queue = np.zeros((n_envs, 2 * len(SHAPE_KEYS)), dtype=np.int64)
+        self.queue_pos = np.zeros(n_envs, dtype=np.int64)
+        self.scores = np.zeros(n_envs, dtype=np.int64)
+        self.pieces_placed = np.zeros(n_envs, dtype=np.int64)
+        self.reset()
+
+    def _new_bags(self, count):
+        """
+        Draw shuffled 7-bags.
+
+        Args:
+            count (int): Number of bags.
+
+        Returns:
+            np.ndarray: Array of shape (count, 7) of shape ids.
+        """
+        return self.rng.random((count, len(SHAPE_KEYS))).argsort(axis=1)
+
+    def _reset_envs(self, index):
+        """
+        Reset the selected games.
+
+        Args:
+            index (np.ndarray): Indices of the games to reset.
+        """
+        n_bag = len(SHAPE_KEYS)
+        self.boards[index] = 0
+        self.queue[index, :n_bag] = self._new_bags(len(index))
+        self.queue[index, n_bag:] = self._new_bags(len(index))
+        self.queue_pos[index] = 0
+        self.scores[index] = 0
+        self.pieces_placed[index] = 0
+
+    def reset(self):
+        """
+        Reset all games.
+
+        Returns:
+            np.ndarray: The boards, shape (n_envs, rows).
+        """
+        self._reset_envs(np.arange(self.n_envs))
+        return self.boards
+
+    @property
+    def current_pieces(self):
+        """Shape id of each game's current piece."""
+        return self.queue[np.arange(self.n_envs), self.queue_pos]
+
+    @property
+    def next_pieces(self):
+        """Shape id of each game's next piece."""
+        return self.queue[np.arange(self.n_envs), self.queue_pos + 1]
+
+    def _shifted_masks(self, shapes, rotations, xs):
+        """
+        Get the piece row masks shifted to the target columns.
+
+        Args:
+            shapes (np.ndarray): Shape ids.
+            rotations (np.ndarray): Rotation indices.
+            xs (np.ndarray): Target x per game.
+
+        Returns:
+            tuple: (masks of shape (n, 4), bool array of in-bounds placements).
+        """
+        masks = ROW_MASKS[shapes, rotations]
+        in_bounds = (xs + MIN_COL[shapes, rotations] >= 0) & (xs + MAX_COL[shapes, rotations] < self.cols)
+        left = np.maximum(xs, 0)[:, None]
+        right = np.maximum(-xs, 0)[:, None]
+        return (masks << left) >> right, in_bounds
+
+    def _collisions(self, masks):
+        """
+        Test the pieces against the boards at every row offset.
+
+        Args:
+            masks (np.ndarray): Shifted row masks, shape (n, 4).
+
+        Returns:
+            np.ndarray: Bool array of shape (n, rows + 1), True where the
+            piece placed at that y overlaps blocks or the floor.
+        """
+        padded = np.concatenate(
+            [self.boards, np.full((self.n_envs, PIECE_ROWS), self.full_mask, dtype=np.int64)], axis=1)
+        offsets = np.arange(self.rows + 1)[:, None] + np.arange(PIECE_ROWS)[None, :]
+        return ((padded[:, offsets] & masks[:, None, :]) != 0).any(axis=2)
+
+    def step(self, actions):
+        """
+        Hard drop one piece in every game.
+
+        An invalid action, i.e. a target x that puts the piece outside the
+        board or a placement that collides at the spawn row, does not raise:
+        it places nothing and ends that game, which is reported as done and
+        reset like a game whose next piece cannot spawn. The other games
+        step normally.
+
+        Args:
+            actions (np.ndarray): Array of shape (n_envs, 2) holding the
+                rotation count and target x for each game.
+
+        Returns:
+            tuple: (boards, lines cleared per game, done flags, final scores
+            of the games that ended this step, 0 elsewhere).
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        envs = np.arange(self.n_envs)
+        shapes = self.current_pieces
+        rotations = actions[:, 0] % N_ROTATIONS[shapes]
+        masks, in_bounds = self._shifted_masks(shapes, rotations, actions[:, 1])
+        collide = self._collisions(masks)
+        # The piece falls from the spawn row until the first collision.
+        valid = in_bounds & ~collide[:, 0]
+        landing = collide.argmax(axis=1) - 1
+
+        rows = landing[:, None] + np.arange(PIECE_ROWS)[None, :]
+        write = valid[:, None] & (masks != 0) & (rows >= 0) & (rows < self.rows)
+        np.bitwise_or.at(self.boards, (np.broadcast_to(envs[:, None], rows.shape)[write], rows[write]),
+                         masks[write])
+
+        full = self.boards == self.full_mask
+        lines = full.sum(axis=1)
+        cleared = np.flatnonzero(lines)
+        if len(cleared):
+            # Stable sort puts the full rows on top in board order, then zero them.
+            order = np.argsort(~full[cleared], axis=1, kind="stable")
+            compacted = np.take_along_axis(self.boards[cleared], order, axis=1)
+            compacted[np.arange(self.rows)[None, :] < lines[cleared, None]] = 0
+            self.boards[cleared] = compacted
+        self.scores += lines
+        self.pieces_placed += valid
+
+        self.queue_pos += 1
+        refill = np.flatnonzero(self.queue_pos >= len(SHAPE_KEYS))
+        if len(refill):
+            n_bag = len(SHAPE_KEYS)
+            self.queue[refill, :n_bag] = self.queue[refill, n_bag:]
+            self.queue[refill, n_bag:] = self._new_bags(len(refill))
+            self.queue_pos[refill] -= n_bag
+
+        spawn_shapes = self.current_pieces
+        spawn_x = (self.cols - SPAWN_WIDTH[spawn_shapes]) // 2
+        spawn_masks, _ = self._shifted_masks(spawn_shapes, np.zeros(self.n_envs, dtype=np.int64), spawn_x)
+        blocked = ((self.boards[:, :PIECE_ROWS] & spawn_masks) != 0).any(axis=1)
+        dones = ~valid | blocked
+
+        final_scores = np.where(dones, self.scores, 0)
+        done_index = np.flatnonzero(dones)
+        if len(done_index):
+            self._reset_envs(done_index)
+        return self.boards, lines, dones, final_scores
+
+    def get_possible_actions(self, env_index):
+        """
+        List the placements available to one game.
+
+        Args:
+            env_index (int): Index of the game.
+
+        Returns:
+            list: List of (rotations, x) tuples valid at the spawn row.
+        """
+        shape = int(self.current_pieces[env_index])
+        actions = []
+        for rotations in range(int(N_ROTATIONS[shape])):
+            for x in range(-int(MIN_COL[shape, rotations]), self.cols - int(MAX_COL[shape, rotations])):
+                mask = ROW_MASKS[shape, rotations]
+                shifted = (mask << max(x, 0)) >> max(-x, 0)
+                if not (self.boards[env_index, :PIECE_ROWS] & shifted).any():
+                    actions.append((rotations, x))
+        return actions
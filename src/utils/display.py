@@ -1,5 +1,5 @@
 import pygame
-from src.utils.config import *
+from src.utils.render_config import *
 import json
 import os
 import sys
@@ -168,12 +168,23 @@ def adjust_color(color, factor):
     return tuple(max(0, min(255, int(c * factor))) for c in color)
 
 
-def draw_block_3d(screen, color, px, py):
+# Pre-rendered blocks and ghost cells keyed by (color, block size) and grid
+# backgrounds keyed by (block size, rows, columns); a new BLOCK_SIZE gets new
+# entries.
+_block_cache = {}
+_ghost_cache = {}
+_background_cache = {}
+
+# Border lines are centered on the block edge, so sprites carry this margin.
+BLOCK_PAD = max(BORDER_WIDTH, 3) // 2 + 1
+
+
+def render_block_3d(surface, color, px, py):
     """
-    Draw a 3D-styled block at the specified grid coordinates.
+    Draw a 3D-styled block with polygons and lines.
 
     Args:
-        screen (pygame.Surface): The game screen.
+        surface (pygame.Surface): Target surface.
         color (tuple): RGB color of the block.
         px (int): X-coordinate.
         py (int): Y-coordinate.
@@ -181,28 +192,204 @@ def draw_block_3d(screen, color, px, py):
     edge = 6
     light_color = adjust_color(color, 1.3)
     dark_color = adjust_color(color, 0.6)
-    pygame.draw.polygon(screen, light_color, [
+    pygame.draw.polygon(surface, light_color, [
         (px, py), (px + BLOCK_SIZE, py), (px + BLOCK_SIZE - edge, py + edge), (px + edge, py + edge)
     ])
-    pygame.draw.polygon(screen, light_color, [
+    pygame.draw.polygon(surface, light_color, [
         (px, py), (px, py + BLOCK_SIZE), (px + edge, py + BLOCK_SIZE - edge), (px + edge, py + edge)
     ])
-    pygame.draw.polygon(screen, dark_color, [
+    pygame.draw.polygon(surface, dark_color, [
         (px + BLOCK_SIZE, py), (px + BLOCK_SIZE, py + BLOCK_SIZE),
         (px + BLOCK_SIZE - edge, py + BLOCK_SIZE - edge), (px + BLOCK_SIZE - edge, py + edge)
     ])
-    pygame.draw.polygon(screen, dark_color, [
+    pygame.draw.polygon(surface, dark_color, [
         (px, py + BLOCK_SIZE), (px + BLOCK_SIZE, py + BLOCK_SIZE),
         (px + BLOCK_SIZE - edge, py + BLOCK_SIZE - edge), (px + edge, py + BLOCK_SIZE - edge)
     ])
-    pygame.draw.polygon(screen, color, [
+    pygame.draw.polygon(surface, color, [
         (px + edge, py + edge), (px + BLOCK_SIZE - edge, py + edge),
         (px + BLOCK_SIZE - edge, py + BLOCK_SIZE - edge), (px + edge, py + BLOCK_SIZE - edge)
     ])
-    pygame.draw.line(screen, (0, 0, 0), (px, py), (px + BLOCK_SIZE, py), BORDER_WIDTH)
-    pygame.draw.line(screen, (0, 0, 0), (px, py), (px, py + BLOCK_SIZE), 3)
-    pygame.draw.line(screen, (0, 0, 0), (px, py + BLOCK_SIZE), (px + BLOCK_SIZE, py + BLOCK_SIZE), BORDER_WIDTH)
-    pygame.draw.line(screen, (0, 0, 0), (px + BLOCK_SIZE, py), (px + BLOCK_SIZE, py + BLOCK_SIZE), BORDER_WIDTH)
+    pygame.draw.line(surface, (0, 0, 0), (px, py), (px + BLOCK_SIZE, py), BORDER_WIDTH)
+    pygame.draw.line(surface, (0, 0, 0), (px, py), (px, py + BLOCK_SIZE), 3)
+    pygame.draw.line(surface, (0, 0, 0), (px, py + BLOCK_SIZE), (px + BLOCK_SIZE, py + BLOCK_SIZE), BORDER_WIDTH)
+    pygame.draw.line(surface, (0, 0, 0), (px + BLOCK_SIZE, py), (px + BLOCK_SIZE, py + BLOCK_SIZE), BORDER_WIDTH)
+
+
+def get_block_sprite(color):
+    """
+    Get the pre-rendered block for a color at the current block size.
+
+    Args:
+        color (tuple): RGB color of the block.
+
+    Returns:
+        pygame.Surface: Transparent sprite, ``BLOCK_PAD`` pixels larger than
+        the block on every side.
+    """
+    key = (tuple(color), BLOCK_SIZE)
+    sprite = _block_cache.get(key)
+    if sprite is None:
+        size = int(BLOCK_SIZE) + 2 * BLOCK_PAD + 1
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        render_block_3d(sprite, color, BLOCK_PAD, BLOCK_PAD)
+        _block_cache[key] = sprite
+    return sprite
+
+
+def draw_block_3d(screen, color, px, py):
+    """
+    Draw a 3D-styled block at the specified grid coordinates.
+
+    Args:
+        screen (pygame.Surface): The game screen.
+        color (tuple): RGB color of the block.
+        px (int): X-coordinate.
+        py (int): Y-coordinate.
+    """
+    screen.blit(get_block_sprite(color), (int(px) - BLOCK_PAD, int(py) - BLOCK_PAD))
+
+
+def get_grid_background():
+    """
+    Get the pre-rendered empty board with its cell outlines.
+
+    Returns:
+        pygame.Surface: Surface of size (BOARD_WIDTH, BOARD_HEIGHT).
+    """
+    key = (BLOCK_SIZE, ROWS, COLUMNS)
+    background = _background_cache.get(key)
+    if background is None:
+        background = pygame.Surface((int(BOARD_WIDTH) + 1, int(BOARD_HEIGHT) + 1))
+        background.fill(ui_config["background_color"])
+        for y in range(ROWS):
+            for x in range(COLUMNS):
+                rect = pygame.Rect(x * BLOCK_SIZE, y * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
+                pygame.draw.rect(background, ui_config["grid_color"], rect, GRID_WIDTH)
+        _background_cache[key] = background
+    return background
+
+
+def board_origin(id):
+    """
+    Get the screen position of a board's top-left corner.
+
+    Args:
+        id (int): The ID of the board.
+
+    Returns:
+        tuple: (x, y) screen coordinates.
+    """
+    if id == 0:
+        x_offset = CENTER_X - BOARD_WIDTH - PANEL_WIDTH - PANEL_MARGIN * 2
+    else:
+        x_offset = CENTER_X + PANEL_WIDTH + PANEL_MARGIN * 2
+    return x_offset, (INITIAL_HEIGHT - BOARD_HEIGHT) // 2
+
+
+class BoardRenderer:
+    """
+    Draws one board, repainting only the cells that changed since the last frame.
+
+    Locked blocks are kept on an off-screen copy of the grid background; each
+    frame the changed cells are repainted there, the copy is blitted, and the
+    ghost and current piece are drawn on top. ``draw`` returns the screen
+    areas that changed, for ``pygame.display.update``.
+    """
+
+    def __init__(self, id):
+        """
+        Initialize the renderer.
+
+        Args:
+            id (int): The ID of the board.
+        """
+        self.id = id
+        self.surface = None
+        self.cells = None
+        self.block_size = None
+        self.piece_rects = []
+
+    def _rebuild(self):
+        """Start over from an empty board at the current block size."""
+        self.surface = get_grid_background().copy()
+        self.cells = [[0] * COLUMNS for _ in range(ROWS)]
+        self.block_size = BLOCK_SIZE
+
+    def _cell_rect(self, x, y):
+        """
+        Get the area of a cell on the board surface, sprite margin included.
+
+        Args:
+            x (int): Column.
+            y (int): Row.
+
+        Returns:
+            pygame.Rect: The area.
+        """
+        size = int(BLOCK_SIZE) + 2 * BLOCK_PAD + 1
+        return pygame.Rect(int(x * BLOCK_SIZE) - BLOCK_PAD, int(y * BLOCK_SIZE) - BLOCK_PAD, size, size)
+
+    def _repaint_cell(self, x, y):
+        """
+        Repaint a cell of the board surface and the neighbours its sprite overlaps.
+
+        Args:
+            x (int): Column.
+            y (int): Row.
+
+        Returns:
+            pygame.Rect: The repainted area on the board surface.
+        """
+        rect = self._cell_rect(x, y).clip(self.surface.get_rect())
+        self.surface.blit(get_grid_background(), rect.topleft, rect)
+        self.surface.set_clip(rect)
+        for ny in range(max(0, y - 1), min(ROWS, y + 2)):
+            for nx in range(max(0, x - 1), min(COLUMNS, x + 2)):
+                if self.cells[ny][nx]:
+                    draw_block_3d(self.surface, self.cells[ny][nx], nx * BLOCK_SIZE, ny * BLOCK_SIZE)
+        self.surface.set_clip(None)
+        return rect
+
+    def draw(self, screen, board, piece=None, ghost_piece=None):
+        """
+        Draw the board with its ghost and current piece.
+
+        Args:
+            screen (pygame.Surface): The game screen.
+            board (list of list): Game board.
+            piece (Piece, optional): Current piece.
+            ghost_piece (Piece, optional): Ghost of the current piece.
+
+        Returns:
+            list[pygame.Rect]: Screen areas changed since the last frame.
+        """
+        if self.surface is None or self.block_size != BLOCK_SIZE:
+            self._rebuild()
+        x_offset, y_offset = board_origin(self.id)
+        dirty = []
+        changed = []
+        for y, row in enumerate(board):
+            old = self.cells[y]
+            if row != old:
+                for x, cell in enumerate(row):
+                    if cell != old[x]:
+                        changed.append((x, y))
+                self.cells[y] = list(row)
+        for x, y in changed:
+            dirty.append(self._repaint_cell(x, y).move(x_offset, y_offset))
+        screen.blit(self.surface, (x_offset, y_offset))
+
+        piece_rects = []
+        if ghost_piece is not None:
+            draw_ghost_piece(self.id, screen, ghost_piece)
+            piece_rects += [self._cell_rect(x, y).move(x_offset, y_offset) for x, y in ghost_piece.get_cells()]
+        if piece is not None:
+            draw_piece(self.id, screen, piece.get_cells(), piece.color)
+            piece_rects += [self._cell_rect(x, y).move(x_offset, y_offset) for x, y in piece.get_cells()]
+        dirty += self.piece_rects + piece_rects
+        self.piece_rects = piece_rects
+        return dirty
 
 
 def draw_grid(id, screen, board):
@@ -214,15 +401,10 @@ def draw_grid(id, screen, board):
         screen (pygame.Surface): The game screen.
         board (list of list): Game board.
     """
-    if id == 0:
-        x_offset = CENTER_X - BOARD_WIDTH - PANEL_WIDTH - PANEL_MARGIN * 2
-    elif id == 1:
-        x_offset = CENTER_X + PANEL_WIDTH + PANEL_MARGIN * 2
-    y_offset = (INITIAL_HEIGHT - BOARD_HEIGHT)//2
+    x_offset, y_offset = board_origin(id)
+    screen.blit(get_grid_background(), (x_offset, y_offset))
     for y in range(ROWS):
         for x in range(COLUMNS):
-            rect = pygame.Rect(x_offset + x * BLOCK_SIZE, y_offset + y * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-            pygame.draw.rect(screen, ui_config["grid_color"], rect, GRID_WIDTH)
             if board[y][x]:
                 draw_block_3d(screen, board[y][x], x_offset + x * BLOCK_SIZE, y_offset +  y * BLOCK_SIZE)
 
@@ -245,6 +427,25 @@ def draw_piece(id, screen, cells, color):
         draw_block_3d(screen, color, x_offset + x * BLOCK_SIZE, y_offset + y * BLOCK_SIZE)
 
 
+def get_ghost_sprite(color):
+    """
+    Get the translucent ghost cell for a color at the current block size.
+
+    Args:
+        color (tuple): RGB color of the piece.
+
+    Returns:
+        pygame.Surface: Reusable cell surface.
+    """
+    key = (tuple(color), BLOCK_SIZE)
+    sprite = _ghost_cache.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
+        sprite.fill((color[0], color[1], color[2], 100))
+        _ghost_cache[key] = sprite
+    return sprite
+
+
 def draw_ghost_piece(id, screen, ghost_piece):
     """
     Draw the ghost (shadow) piece.
@@ -253,15 +454,9 @@ def draw_ghost_piece(id, screen, ghost_piece):
         screen (pygame.Surface): The game screen.
         ghost_piece: The ghost piece instance.
     """
-    ghost_color = (ghost_piece.color[0], ghost_piece.color[1], ghost_piece.color[2], 100)
-    if id == 0:
-        x_offset = CENTER_X - BOARD_WIDTH - PANEL_WIDTH - PANEL_MARGIN * 2
-    elif id == 1:
-        x_offset = CENTER_X + PANEL_WIDTH + PANEL_MARGIN * 2
-    y_offset = (INITIAL_HEIGHT - BOARD_HEIGHT)//2
+    x_offset, y_offset = board_origin(id)
+    ghost_cell = get_ghost_sprite(ghost_piece.color)
     for (x, y) in ghost_piece.get_cells():
-        ghost_cell = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
-        ghost_cell.fill(ghost_color)
         screen.blit(ghost_cell, (x * BLOCK_SIZE + x_offset, y_offset + y * BLOCK_SIZE))
 
 
@@ -290,6 +485,22 @@ def draw_next_piece(screen, env, panel_rect, font):
                 draw_block_3d(screen, temp_piece.color, offset_x + j * BLOCK_SIZE, offset_y + i * BLOCK_SIZE)
 
 
+def get_panel_rect(id):
+    """
+    Get the screen area of a side panel.
+
+    Args:
+        id (int): The ID of the panel.
+
+    Returns:
+        pygame.Rect: The panel rectangle.
+    """
+    y_offset = (INITIAL_HEIGHT - BOARD_HEIGHT)//2
+    if id == 0:
+        return pygame.Rect(CENTER_X - PANEL_WIDTH - PANEL_MARGIN, y_offset, PANEL_WIDTH, BOARD_HEIGHT)
+    return pygame.Rect(CENTER_X + PANEL_MARGIN, y_offset, PANEL_WIDTH, BOARD_HEIGHT)
+
+
 def draw_panel(id, screen, env, font, mode):
     """
     Draw the side panel.
@@ -304,14 +515,8 @@ def draw_panel(id, screen, env, font, mode):
     Returns:
         pygame.Rect: The rectangle of the mode toggle button.
     """
-    y_offset = (INITIAL_HEIGHT - BOARD_HEIGHT)//2
+    panel_rect = get_panel_rect(id)
     if id == 0:
-        panel_rect = pygame.Rect(
-            CENTER_X - PANEL_WIDTH - PANEL_MARGIN,
-            y_offset,
-            PANEL_WIDTH,
-            BOARD_HEIGHT
-        )
         pygame.draw.rect(screen, ui_config["panel_bg_color"], panel_rect)
         draw_next_piece(screen, env, panel_rect, font)
         score_text = font.render(f"Score: {env.score}", True, ui_config["text_color"])
@@ -327,12 +532,6 @@ def draw_panel(id, screen, env, font, mode):
         return pause_button_rect
 
     if id == 1:
-        panel_rect = pygame.Rect(
-            CENTER_X + PANEL_MARGIN,
-            y_offset,
-            PANEL_WIDTH,
-            BOARD_HEIGHT
-        )
         pygame.draw.rect(screen, ui_config["panel_bg_color"], panel_rect)
         draw_next_piece(screen, env, panel_rect, font)
         score_text = font.render(f"Score: {env.score}", True, ui_config["text_color"])
@@ -0,0 +1,36 @@
+import pygame
+
+from src.utils.config import *
+
+# Display-dependent settings. Importing this module initializes pygame, so
+# only the UI (src.utils.display) imports it; the simulation core uses
+# src.utils.config and stays free of pygame.
+pygame.init()
+
+DEFAULT_SCREEN_WIDTH = 1920
+DEFAULT_SCREEN_HEIGHT = 1080
+display_info = pygame.display.Info()
+INITIAL_WIDTH = min(int(display_info.current_w), DEFAULT_SCREEN_WIDTH)
+INITIAL_HEIGHT = min(int(display_info.current_h), DEFAULT_SCREEN_HEIGHT)
+
+scale_x = INITIAL_WIDTH / DEFAULT_SCREEN_WIDTH
+scale_y = INITIAL_HEIGHT / DEFAULT_SCREEN_HEIGHT
+scale_factor = min(scale_x, scale_y)
+
+standard_font_size = int(24 * scale_factor)
+font = pygame.font.SysFont("Arial", max(standard_font_size, 16))
+
+large_font_size = int(45 * scale_factor)
+font_large = pygame.font.SysFont("Arial", max(large_font_size, 20), bold=True)
+
+BLOCK_SIZE = ui_config["block_size"] * scale_factor
+ROWS = env_params["rows"]
+COLUMNS = env_params["cols"]
+BOARD_WIDTH = COLUMNS * BLOCK_SIZE
+BOARD_HEIGHT = ROWS * BLOCK_SIZE
+PANEL_WIDTH = ui_config["panel_width"] * scale_factor
+PANEL_MARGIN = ui_config["panel_margin"] * scale_factor
+CENTER_X = INITIAL_WIDTH // 2
+CENTER_Y = INITIAL_HEIGHT // 2
+GRID_WIDTH = int(ui_config["grid_width"] * scale_factor)
+BORDER_WIDTH = int(ui_config["border_width"] * scale_factor)
@@ -0,0 +1,85 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from src.env.piece import Piece
+from src.utils import display
+from src.utils.display import (BoardRenderer, board_origin, draw_ghost_piece, draw_grid, draw_piece,
+                               get_block_sprite, get_ghost_sprite, get_grid_background)
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+def empty_board():
+    """
+    Create an empty board of the configured size.
+
+    Returns:
+        list[list]: Board with no blocks.
+    """
+    return [[0] * display.COLUMNS for _ in range(display.ROWS)]
+
+
+def new_screen():
+    """
+    Create an off-screen surface the size of the window.
+
+    Returns:
+        pygame.Surface: The surface.
+    """
+    return pygame.Surface((display.INITIAL_WIDTH, display.INITIAL_HEIGHT))
+
+
+def test_sprites_and_background_are_rendered_once():
+    assert get_block_sprite(RED) is get_block_sprite(list(RED))
+    assert get_block_sprite(RED) is not get_block_sprite(BLUE)
+    assert get_ghost_sprite(RED) is get_ghost_sprite(RED)
+    assert get_ghost_sprite(RED).get_size() == (display.BLOCK_SIZE, display.BLOCK_SIZE)
+    assert get_grid_background() is get_grid_background()
+
+
+def test_renderer_matches_a_full_redraw():
+    renderer = BoardRenderer(0)
+    screen = new_screen()
+    board = empty_board()
+    for step, (x, y) in enumerate([(0, display.ROWS - 1), (1, display.ROWS - 1), (1, display.ROWS - 2)]):
+        board[y][x] = RED if step % 2 else BLUE
+        piece = Piece("T", x=4, y=step)
+        ghost = piece.clone()
+        ghost.y = display.ROWS - 4
+        renderer.draw(screen, board, piece, ghost)
+
+        expected = new_screen()
+        draw_grid(0, expected, board)
+        draw_ghost_piece(0, expected, ghost)
+        draw_piece(0, expected, piece.get_cells(), piece.color)
+        origin = board_origin(0)
+        area = pygame.Rect(origin, (display.BOARD_WIDTH, display.BOARD_HEIGHT))
+        assert (pygame.image.tobytes(screen.subsurface(area), "RGB")
+                == pygame.image.tobytes(expected.subsurface(area), "RGB"))
+
+
+def test_renderer_reports_only_changed_areas():
+    renderer = BoardRenderer(1)
+    screen = new_screen()
+    board = empty_board()
+    assert renderer.draw(screen, board) == []
+
+    x, y = 2, display.ROWS - 1
+    board[y][x] = RED
+    dirty = renderer.draw(screen, board)
+    assert len(dirty) == 1
+    cell_x, cell_y = board_origin(1)
+    assert dirty[0].collidepoint(cell_x + (x + 0.5) * display.BLOCK_SIZE, cell_y + (y + 0.5) * display.BLOCK_SIZE)
+    assert renderer.draw(screen, board) == []
+
+    # A piece is dirty where it is drawn and, one frame later, where it was.
+    piece = Piece("O", x=4, y=0)
+    drawn = renderer.draw(screen, board, piece)
+    assert len(drawn) == len(piece.get_cells())
+    assert renderer.draw(screen, board) == drawn
+    assert renderer.draw(screen, board) == []
@@ -0,0 +1,40 @@
+import argparse
+
+from src.agents.trainer import train
+from src.utils.config import mode_weights, env_params
+
+
+def main():
+    """
+    Headless training entry point.
+    """
+    parser = argparse.ArgumentParser(description="Train TetrisRL weights with an evolution strategy.")
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--population", type=int, default=50)
+    parser.add_argument("--sigma", type=float, default=0.1)
+    parser.add_argument("--alpha", type=float, default=0.01)
+    parser.add_argument("--games", type=int, default=3, help="Games per population member.")
+    parser.add_argument("--max-pieces", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--checkpoint-dir", default="checkpoints")
+    parser.add_argument("--init", default="easy", choices=list(mode_weights), help="Mode whose weights to start from.")
+    args = parser.parse_args()
+
+    weights = train(mode_weights[args.init]["weights"],
+                    generations=args.generations,
+                    population=args.population,
+                    sigma=args.sigma,
+                    alpha=args.alpha,
+                    games_per_member=args.games,
+                    max_pieces=args.max_pieces,
+                    rows=env_params["rows"],
+                    cols=env_params["cols"],
+                    seed=args.seed,
+                    workers=args.workers,
+                    checkpoint_dir=args.checkpoint_dir)
+    print("Final weights:", weights.tolist())
+
+
+if __name__ == "__main__":
+    main()